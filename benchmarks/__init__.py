@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+"""performance benchmarks of hot paths
+
+Any module **bench_*.py** provides a function **benchmarks()**
+yielding pairs of benchmark name and function to time
+(set up in advance and invoked without arguments).
+
+Run all benchmarks from the project root by
+
+    $ python -m benchmarks
+
+and compare results of different commits by
+
+    $ python -m benchmarks --compare .benchmarks/<commit>.json
+
+see **python -m benchmarks --help** for more options.
+"""
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+from argparse import ArgumentParser
+from datetime import datetime
+from fnmatch import fnmatch
+from importlib import import_module
+from json import dump, load
+from os import makedirs, path
+from platform import python_version
+from statistics import mean
+from subprocess import run
+from timeit import Timer
+
+MODULES = 'bench_curves', 'bench_interpolation', 'bench_numerics', \
+    'bench_fit', 'bench_memory'
+OUTPUT = '.benchmarks'
+
+
+def commit():
+    """current git commit (if any)"""
+    try:
+        cmd = 'git', 'rev-parse', '--short', 'HEAD'
+        return run(cmd, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def collect(pattern='*'):
+    """collect benchmarks from all **MODULES** matching **pattern**
+
+    together with the module's **measure()** function (if any)
+    """
+    for name in MODULES:
+        module = import_module(f"{__package__}.{name}")
+        func_measure = getattr(module, 'measure', measure)
+        for key, func in module.benchmarks():
+            key = f"{name[6:]}.{key}"
+            if fnmatch(key, pattern):
+                yield key, func, func_measure
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """time **func** and return seconds per call"""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_time / 0.2))
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return {'best': min(times), 'mean': mean(times),
+            'number': number, 'repeat': repeat, 'unit': 's'}
+
+
+def compare(results, reference):
+    """print ratios of **results** and **reference**"""
+    print(f"\n{'benchmark':60} {'before':>10} {'after':>10} {'ratio':>7}")
+    for key, value in results.items():
+        if key not in reference:
+            continue
+        before, after = reference[key]['best'], value['best']
+        ratio = after / before if before else float('nan')
+        print(f"{key:60} {before:10.3g} {after:10.3g} {ratio:7.2f}")
+
+
+def main(argv=None):
+    parser = ArgumentParser(prog='python -m benchmarks',
+                            description='run curves benchmarks')
+    parser.add_argument('-k', '--pattern', default='*',
+                        help='run only benchmarks matching glob pattern')
+    parser.add_argument('-o', '--output', default=None,
+                        help=f'result file (default: {OUTPUT}/<commit>.json)')
+    parser.add_argument('-r', '--repeat', type=int, default=5,
+                        help='number of timing repetitions')
+    parser.add_argument('-t', '--min-time', type=float, default=0.2,
+                        help='minimal time per repetition in seconds')
+    parser.add_argument('-c', '--compare', default=None,
+                        help='result file to compare with')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for key, func, func_measure in collect(args.pattern):
+        result = results[key] = func_measure(func, args.repeat, args.min_time)
+        print(f"{key:60} {result['best']:10.3g} {result['unit']}")
+
+    rev = commit()
+    output = args.output
+    if output is None:
+        name = rev or datetime.now().strftime('%Y%m%d%H%M%S')
+        output = path.join(OUTPUT, f"{name}.json")
+    if path.dirname(output):
+        makedirs(path.dirname(output), exist_ok=True)
+    meta = {'commit': rev, 'date': datetime.now().isoformat(),
+            'python': python_version()}
+    with open(output, 'w') as file:
+        dump({'meta': meta, 'results': results}, file, indent=2)
+    print(f"\nresults stored in {output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(results, load(file)['results'])
+
+
+if __name__ == '__main__':
+    main()
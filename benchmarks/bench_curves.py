@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+from functools import partial
+
+from curves import X, Curve
+from curves.functions import exp, sin
+
+DEPTHS = 1, 10, 100
+POINTS = 1_000
+
+
+def tree(depth):
+    """curve expression of given depth using operations and functions"""
+    curve = X
+    for i in range(depth):
+        if i % 3 == 0:
+            curve = 2 * curve ** 2 + 3 * X + 1
+        elif i % 3 == 1:
+            curve = exp @ (curve / 1e3) - X
+        else:
+            curve = sin @ curve + X / 7
+    return curve
+
+
+def recompile(curve):
+    curve._changed()  # invalidate compiled function
+    return curve.compile()
+
+
+def benchmarks():
+    x = [i / POINTS for i in range(POINTS)]
+    for depth in DEPTHS:
+        curve = tree(depth)
+        yield f"call[depth={depth}]", partial(curve, 0.5)
+        yield f"compiled[depth={depth}]", partial(curve.compile(), 0.5)
+        yield f"loop[depth={depth},n={POINTS}]", \
+            partial(lambda c: [c(_) for _ in x], curve)
+        yield f"eval_many[depth={depth},n={POINTS}]", \
+            partial(curve.eval_many, x)
+        yield f"compile[depth={depth}]", partial(recompile, curve)
+
+    named = Curve(tree(10), id='bench_named')
+    yield "named.call[depth=10]", partial(named, 0.5)
+    yield "named.compiled[depth=10]", partial(named.compile(), 0.5)
+
+    cached = tree(100).cached()
+    cached(0.5)
+    yield "cached.call[depth=100]", partial(cached, 0.5)
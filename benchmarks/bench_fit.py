@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+from functools import partial
+from math import exp
+
+from curves import Curve, Integral, X, fit, fit_many
+from curves.functions import sin
+from curves.interpolation import linear
+
+GRIDS = 10, 30, 100
+
+
+def zero_bond(curve, t):
+    """zero bond price for continuous compounded zero rate curve"""
+    return 100 * exp(-curve(t) * t)
+
+
+def forward_zero_bond(curve, t):
+    """zero bond price for instantaneous forward rate curve"""
+    return 100 * exp(-Integral(curve)(t))
+
+
+def benchmarks():
+    for n in GRIDS:
+        grid = [30 * (i + 1) / n for i in range(n)]
+        targets = [100 * exp(-0.02 * t - 0.001 * t * t) for t in grid]
+
+        curve = Curve(linear([0, 30], [0.01, 0.01]))
+        yield f"fit[zero,grid={n}]", \
+            partial(fit, curve, grid, partial(zero_bond, curve),
+                    targets)
+        yield f"fit[zero,incremental,grid={n}]", \
+            partial(fit, curve, grid, partial(zero_bond, curve),
+                    targets, incremental=True)
+
+        if n <= 30:
+            # expensive base curve, i.e. zero rates by quadrature,
+            # where incremental fitting pays off
+            curve = Curve(Integral(0.01 + 0.0005 * X + 0.001 * sin)) / X
+            yield f"fit[integral,grid={n}]", \
+                partial(fit, curve, grid, partial(zero_bond, curve),
+                        targets)
+            yield f"fit[integral,incremental,grid={n}]", \
+                partial(fit, curve, grid, partial(zero_bond, curve),
+                        targets, incremental=True)
+
+        curves = [Curve(0.01 + i / 1e4) for i in range(10)]
+        err_funcs = [partial(zero_bond, c) for c in curves]
+        yield f"fit_many[zero,curves=10,grid={n}]", \
+            partial(fit_many, curves, grid, err_funcs, [targets] * 10)
+
+        if n <= 10:
+            curve = Curve(0.01)
+            yield f"fit[forward,grid={n}]", \
+                partial(fit, curve, grid,
+                        partial(forward_zero_bond, curve), targets)
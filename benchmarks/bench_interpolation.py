@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+from functools import partial
+from math import exp
+
+from curves import interpolation
+
+CLASSES = 'no', 'zero', 'left', 'right', 'nearest', 'linear', \
+    'piecewise_linear', 'loglinear', 'loglinearrate', 'logconstantrate'
+KNOTS = 10, 100, 10_000
+POINTS = 1_000
+
+
+def knots(n):
+    x_list = [1 + 30 * i / n for i in range(n)]
+    y_list = [exp(-0.02 * x) for x in x_list]
+    return x_list, y_list
+
+
+def benchmarks():
+    for n in KNOTS:
+        x_list, y_list = knots(n)
+        x = [x_list[0] - 1 + (x_list[-1] - x_list[0] + 2) * i / POINTS
+             for i in range(POINTS)]
+        for name in CLASSES:
+            f = getattr(interpolation, name)(x_list, y_list)
+            yield f"{name}.call[knots={n}]", partial(f, x[POINTS // 3])
+            yield f"{name}.eval_many[knots={n},n={POINTS}]", \
+                partial(f.eval_many, x)
+
+        f = interpolation.linear(x_list, y_list)
+        yield f"linear.setitem[knots={n}]", \
+            partial(f.__setitem__, x_list[n // 2], 0.5)
+        yield f"linear.init[knots={n}]", \
+            partial(interpolation.linear, x_list, y_list)
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+"""memory footprint of curve nodes and interpolation knots
+
+Any benchmark function returns a pair of an object and a count of items
+held by it. Instead of time, bytes allocated per item are measured.
+"""
+
+from gc import collect
+from statistics import mean
+from tracemalloc import get_traced_memory, start, stop, is_tracing
+
+from curves import Curve, X
+from curves.interpolation import linear, no
+
+NODES = 10_000
+KNOTS = 10, 100, 10_000
+
+
+def nodes(n):
+    """plain curve nodes"""
+    return [Curve(float(i)) for i in range(n)], n
+
+
+def expression(n):
+    """expression of two nodes per operation"""
+    curve = X
+    for i in range(n // 2):
+        curve = curve + float(i)
+    return curve, n
+
+
+def inplace(n):
+    """single node with in-place operations"""
+    curve = Curve(X)
+    for i in range(n):
+        curve += float(i)
+    return curve, n
+
+
+def knots(cls, n):
+    """interpolation of n knots"""
+    x_list = [float(i) for i in range(n)]
+    return cls(x_list, x_list), n
+
+
+def _bytes(func):
+    collect()
+    tracing = is_tracing()
+    if not tracing:
+        start()
+    before, _ = get_traced_memory()
+    obj, count = func()
+    after, _ = get_traced_memory()
+    if not tracing:
+        stop()
+    del obj
+    return (after - before) / count
+
+
+def measure(func, repeat=5, min_time=0.2):
+    """allocated bytes per item held by the object **func** returns"""
+    sizes = [_bytes(func) for _ in range(repeat)]
+    return {'best': min(sizes), 'mean': mean(sizes),
+            'number': 1, 'repeat': repeat, 'unit': 'B'}
+
+
+def benchmarks():
+    yield f"node[n={NODES}]", lambda: nodes(NODES)
+    yield f"expression[n={NODES}]", lambda: expression(NODES)
+    yield f"inplace[n={NODES}]", lambda: inplace(NODES)
+    for n in KNOTS:
+        for cls in (no, linear):
+            yield f"{cls.__name__}.knot[knots={n}]", \
+                lambda c=cls, k=n: knots(c, k)
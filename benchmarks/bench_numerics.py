@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+from functools import partial
+
+from curves import X, Integral, Derivative, numerics
+from curves.functions import exp, ramp
+from curves.interpolation import linear
+
+METHODS = {'newton_raphson': {'a': 0.5},
+           'secant_method': {'a': 0.5, 'b': 2.0},
+           'bisection_method': {'a': 0.5, 'b': 2.0},
+           'brent_method': {'a': 0.5, 'b': 2.0}}
+
+
+def benchmarks():
+    smooth = exp @ (-X ** 2 / 2)
+    kinked = ramp @ (X - 0.3) + linear([0, 0.5, 1], [0, 1, 0])
+    for name, f in (('smooth', smooth), ('kinked', kinked)):
+        yield f"quadrature[{name}]", partial(numerics.quadrature, f, 0., 1.)
+        yield f"Integral[{name}]", partial(Integral(f), 1.)
+        yield f"Derivative[{name}]", partial(Derivative(f), 0.7)
+
+    f = exp - 3
+    for method, kwargs in METHODS.items():
+        yield f"solve[{method}]", \
+            partial(numerics.solve, f, method, **kwargs)
+
+    # many independent problems f(x) = c
+    c_list = [1.5 + i / 1000 for i in range(1000)]
+    g = exp.eval_many
+
+    def solve_each(method, a, b):
+        return [numerics.solve(exp - c, method, a=a, b=b) for c in c_list]
+
+    def err(x_list):
+        return [y - c for y, c in zip(g(x_list), c_list)]
+
+    for method in ('secant_method', 'brent_method'):
+        yield f"solve[{method}] x 1000", partial(solve_each, method, 0.3, 1.2)
+        yield f"solve_many[{method}] x 1000", \
+            partial(numerics.solve_many, err, method, a=0.3, b=1.2,
+                    size=len(c_list))
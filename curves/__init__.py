@@ -31,11 +31,13 @@ __data__ = ()
 __scripts__ = ()
 __theme__ = ''
 
+from . import dual  # noqa F401 E402
 from . import functions  # noqa F401 E402
 from . import interpolation  # noqa F401 E402
 from . import numerics  # noqa F401 E402
+from . import profiler  # noqa F401 E402
 from .curves import Curve, init  # noqa F401 E402
-from .interpolation import fit  # noqa F401 E402
+from .interpolation import fit, fit_many  # noqa F401 E402
 from .operators import Integral, Derivative  # noqa F401 E402
 from .plot import plotter, plot, lin  # noqa F401 E402
 
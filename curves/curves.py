@@ -10,6 +10,43 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
+from array import array
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import monotonic
+from warnings import warn
+from weakref import WeakValueDictionary
+
+from .dual import Dual, _call as _dual_call
+
+
+# default of Curve.cached to tell decorator parameters from curves
+_DECORATE = object()
+
+# registry of curves by id in current scope
+_registry = ContextVar('registry', default=None)
+
+
+def _ids():
+    """registry of curve ids in current context (created on first use)"""
+    registry = _registry.get()
+    if registry is None:
+        registry = WeakValueDictionary()
+        _registry.set(registry)
+    return registry
+
+
+class _DeprecatedCache:
+    """former class attribute **Curve._cache** of curve ids"""
+
+    def __get__(self, instance, owner=None):
+        warn("Curve._cache is deprecated, use Curve.scope() "
+             "and Curve.release() instead", DeprecationWarning, stacklevel=2)
+        return _ids()
+
+
 def init(curve, /, *, id=''):
     """initialize Curve instance
 
@@ -66,16 +103,244 @@ def no_logging(*_):
     return
 
 
+class _Record:
+    """log record of a named curve operation formatted on demand"""
+
+    __slots__ = 'msg', 'args'
+
+    def __init__(self, msg, *args):
+        self.msg = msg
+        self.args = args
+
+    def __str__(self):
+        return self.msg.format(*self.args)
+
+    __repr__ = __str__
+
+
+class _Sample:
+    """logger passing on only every **n**-th record"""
+
+    def __init__(self, logger, n):
+        self.logger = logger
+        self.n = n
+        self.count = 0
+
+    def __call__(self, record):
+        self.count += 1
+        if self.count % self.n == 1 or self.n == 1:
+            self.logger(record)
+
+
+def _eval_many(f, x_list):
+    """evaluate callable **f** at any point of **x_list** (returns a list)"""
+    eval_many = getattr(f, 'eval_many', None)
+    if eval_many is None:
+        return [f(x) for x in x_list]
+    return eval_many(x_list)
+
+
+def _dependencies(curve, values=True):
+    """mutable nodes **curve** depends on together with their versions
+
+    Nodes are |Curve| instances and, if **values** is true,
+    any other callable carrying a **_version** stamp (like interpolations)
+    as well as callables wrapped by those providing **_nodes()**.
+    """
+    dependencies, stack, seen = [], [curve], set()
+    while stack:
+        node = stack.pop()
+        if not callable(node) or id(node) in seen:
+            continue
+        seen.add(id(node))
+        if isinstance(node, Curve):
+            dependencies.append((node, node._version))
+            stack.append(node.curve)
+            stack.append(node._other)
+            stack.extend(other for _, other in node._inplace_ops)
+        elif values:
+            version = getattr(node, '_version', None)
+            if version is not None:
+                dependencies.append((node, version))
+            nodes = getattr(node, '_nodes', None)
+            if nodes is not None:
+                stack.extend(nodes())
+    return dependencies
+
+
+class _Stamp:
+    """version stamp of all mutable nodes a curve depends on
+
+    While no curve has been modified at all (see **Curve._generation**)
+    and, if **values** is true, no interpolation either
+    (see **Curve._updates**)
+    a stamp is valid without any further check.
+    Otherwise it is valid only if none of the nodes
+    **curve** depends on has been modified.
+    """
+
+    __slots__ = 'curve', 'values', 'generation', 'updates', 'dependencies'
+
+    def __init__(self, curve, values=True):
+        self.curve = curve
+        self.values = values
+        self.generation = Curve._generation
+        self.updates = Curve._updates
+        self.dependencies = _dependencies(curve, values)
+
+    def valid(self, curve=None):
+        if curve is not None and curve is not self.curve:
+            return False
+        if self.generation == Curve._generation and \
+                (not self.values or self.updates == Curve._updates):
+            return True
+        for node, version in self.dependencies:
+            if not node._version == version:
+                return False
+        self.generation = Curve._generation
+        self.updates = Curve._updates
+        return True
+
+
+class _LRUCache:
+    """least recently used cache of function values"""
+
+    def __init__(self, curve, maxsize=128, ttl=None):
+        self.curve = curve
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self._stamp = _Stamp(curve)
+
+    def __call__(self, x):
+        if type(x) not in (float, int):
+            return self.curve(x)
+        with self._lock:
+            if not self._stamp.valid():
+                self._data.clear()
+                self._stamp = _Stamp(self.curve)
+            item = self._data.get(x)
+            if item is not None and (item[1] is None or monotonic() < item[1]):
+                self._data.move_to_end(x)
+                self.hits += 1
+                return item[0]
+            self.misses += 1
+            stamp = self._stamp
+        y = self.curve(x)
+        expires = None if self.ttl is None else monotonic() + self.ttl
+        with self._lock:
+            if stamp is self._stamp:
+                self._data[x] = y, expires
+                self._data.move_to_end(x)
+                if self.maxsize is not None and self.maxsize < len(self._data):
+                    self._data.popitem(last=False)
+        return y
+
+    def _nodes(self):
+        return self.curve,
+
+    def __repr__(self):
+        return repr(self.curve)
+
+    def cache_info(self):
+        """dict of hits, misses, maxsize and currsize of cache"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses,
+                    'maxsize': self.maxsize, 'currsize': len(self._data)}
+
+    def cache_clear(self):
+        """clears cache and statistics"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+
+class _Compiler:
+    """generates source code of a flat function from a curve tree"""
+
+    def __init__(self):
+        self.lines = []
+        self.namespace = {}
+
+    def const(self, value):
+        name = f"_c{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def line(self, code):
+        self.lines.append(f"    {code}")
+
+    def var(self, expr):
+        name = f"_y{len(self.lines)}"
+        self.line(f"{name} = {expr}")
+        return name
+
+    def emit(self, f, x):
+        if isinstance(f, Curve):
+            return f._compile(x, self)
+        return self.var(f"{self.const(f)}({x})")
+
+    def apply(self, op, other, x, y):
+        match op:
+            case 'abs':
+                return self.var(f"abs({y})")
+            case 'neg':
+                return self.var(f"-{y}")
+            case '+' | '-' | '*' | '/':
+                return self.var(f"{y} {op} {self.emit(other, x)}")
+            case '**':
+                return self.var(f"{y} ** {self.const(other)}")
+            case '@':
+                return self.emit(other, y)
+        raise ValueError(f"operation {op} not fount.")
+
+    def build(self, curve):
+        stamp = _Stamp(curve, values=False)
+        logging = type(curve).logger is not no_logging
+        y = curve._compile('x', self)
+        self.namespace.update(_Curve=Curve, _Dual=Dual, _Record=_Record,
+                              _curve=curve, _generation=stamp.generation)
+        source = '\n'.join((
+            "def compiled(x):",
+            "    if not _Curve._generation == _generation:",
+            "        if _Curve._profiling:",
+            "            return _curve(x)",
+            "        return _curve.compile()(x)",
+            "    if type(x) is _Dual or not isinstance(x, (int, float)):",
+            "        return _curve(x)  # sequences and dual numbers",
+            *self.lines,
+            f"    return {y}",
+        ))
+        exec(source, self.namespace)
+        compiled = self.namespace['compiled']
+        compiled.stamp, compiled.logging = stamp, logging
+        return compiled
+
+
 class Curve:
 
-    _cache = {}
+    __slots__ = 'curve', 'id', '_op', '_other', '_inplace_ops', \
+        '_version', '_compiled', '__weakref__'
+    _generation = 0  # counts modifications of any curve
+    _updates = 0  # counts modifications of any interpolation
+    _profiling = False  # compiled functions fall back while profiling
+    _cache = _DeprecatedCache()
     logger = no_logging
     """
     logging function to enable logging of elementary instance operations
     for instances with an **id** attribute
+    (better use |Curve.trace()| to set,
+    since compiled curves see only loggers set by |Curve.trace()|)
+
+    The logging function is called with a log record,
+    which formats as a message only if converted by **str**.
+    So file like loggers need to convert records,
+    e.g. **lambda record: file.write(str(record))**.
 
     >>> from curves import Curve
-    >>> Curve.logger = print
+    >>> Curve.trace(print)
 
     >>> c = Curve(99, id='MyCurve')
     Curve(99, id='MyCurve')
@@ -91,6 +356,8 @@ class Curve:
 
     >>> c += 4
     MyCurve += 4
+
+    >>> Curve.trace(None)
     """
 
     def __init__(self, curve=None, /, *, id='', _op=None, _other=None):
@@ -98,7 +365,8 @@ class Curve:
 
         :param curve: inner curve or curve value or curve variable
         :param id: id of curve (optional), if given,
-            **id** must be unique for all curve instances
+            **id** must be unique for all living curve instances
+            in the current |Curve.scope()|
 
         This turns any function (aka curve) into an algebraic object
         which can handle operators +, -, * , / and @.
@@ -181,18 +449,111 @@ class Curve:
         ...
         ValueError: Curve(γ) already defined
 
+        as long as these are alive or not released (see |Curve.release()|).
+
+        >>> del y
+        >>> y = Curve(2., id='γ')
+
         """
-        if id in self._cache:
+        registry = _ids()
+        if id in registry:
             raise ValueError(f"Curve({id}) already defined")
+        object.__setattr__(self, '_version', 0)
         self.curve = curve
         self.id = id
-        self._inplace_ops = []
+        self._inplace_ops = ()  # allocated on first in-place operation
         self._op = _op
         self._other = _other
         if self.id:
-            self._cache[id] = self
+            registry[id] = self
+        if self.id and type(self).logger is not no_logging:
             _ops = f", _op={_op!r}, _other={_other}" if _op else ''
-            self.logger(f"{self.__class__.__name__}({curve}, id={id!r}{_ops})")
+            cls = self.__class__.__name__
+            record = _Record("{}({}, id={!r}{})", cls, curve, id, _ops)
+            type(self).logger(record)
+
+    @staticmethod
+    @contextmanager
+    def scope():
+        """scope of curve identifiers
+
+        Within a **with** statement curve ids must be unique only
+        among curves created in this scope.
+        Scopes are local to the current thread or :mod:`asyncio` task.
+        Outside of any scope each thread has its own registry of ids.
+
+        >>> from curves import Curve
+        >>> a = Curve(1., id='δ')
+        >>> with Curve.scope():
+        ...     b = Curve(2., id='δ')
+        >>> b
+        2.0
+
+        """
+        token = _registry.set(WeakValueDictionary())
+        try:
+            yield
+        finally:
+            _registry.reset(token)
+
+    @staticmethod
+    def release(*ids):
+        """release curve identifiers of current scope
+
+        :param ids: curve ids to release (optional),
+            if none is given all ids of current scope are released
+
+        Curves remain unchanged but their ids may be used again.
+
+        >>> from curves import Curve
+        >>> a = Curve(1., id='ε')
+        >>> Curve.release('ε')
+        >>> b = Curve(2., id='ε')
+
+        """
+        registry = _ids()
+        for id in ids or tuple(registry):
+            registry.pop(id, None)
+
+    @staticmethod
+    def trace(logger=print, sample=1):
+        """enable or disable logging of named curves
+
+        :param logger: logging function (optional, default is **print**)
+            to be called with a record of any elementary operation
+            of a curve with an **id**, if **None** logging is disabled
+            (see **Curve.logger**)
+        :param sample: pass on only every **sample**-th record
+            (optional, default is 1)
+
+        Records are formatted only if converted by **str**,
+        e.g. if printed or logged by an enabled :mod:`logging` logger.
+        While disabled, no records are created at all
+        and compiled curves (see |Curve.compile()|) skip logging.
+
+        >>> from curves import Curve
+        >>> c = Curve(99, id='MyTrace')
+        >>> f = c.compile()
+
+        >>> Curve.trace(print, sample=2)
+        >>> _ = c(0), c(1), c(2)
+        99 = MyTrace(0)
+        99 = MyTrace(2)
+
+        >>> f = c.compile()
+        >>> _ = f(3), f(4)
+        99 = MyTrace(4)
+
+        >>> Curve.trace(None)
+        >>> _ = c(0), c.compile()(0)
+
+        """
+        if logger is None:
+            logger = no_logging
+        elif 1 < sample:
+            logger = _Sample(logger, sample)
+        Curve.logger = logger
+        Curve._modified()  # recompile with or without logging
 
     @staticmethod
     def _apply(op, other=None, x=None, y=None):
@@ -220,6 +581,35 @@ class Curve:
 
         raise ValueError(f"operation {op} not fount.")
 
+    @staticmethod
+    def _apply_many(op, other=None, x_list=(), y_list=()):
+        try:
+            match op:
+                case 'abs':
+                    return [abs(y) for y in y_list]
+                case 'neg':
+                    return [-y for y in y_list]
+                case '+':
+                    o = _eval_many(other, x_list)
+                    return [y + z for y, z in zip(y_list, o)]
+                case '-':
+                    o = _eval_many(other, x_list)
+                    return [y - z for y, z in zip(y_list, o)]
+                case '*':
+                    o = _eval_many(other, x_list)
+                    return [y * z for y, z in zip(y_list, o)]
+                case '/':
+                    o = _eval_many(other, x_list)
+                    return [y / z for y, z in zip(y_list, o)]
+                case '**':
+                    return [y ** other for y in y_list]
+                case '@':
+                    return _eval_many(other, y_list)
+        except TypeError as e:
+            raise TypeError(f"{op} [{other}] failed for {e}")
+
+        raise ValueError(f"operation {op} not fount.")
+
     @staticmethod
     def _embrace(s, ops='+-/*'):
         s = str(s)
@@ -231,6 +621,44 @@ class Curve:
             return s
         return f"({s})"
 
+    @staticmethod
+    def _modified():
+        Curve._generation += 1
+
+    @staticmethod
+    def _updated():
+        Curve._updates += 1
+
+    def _changed(self):
+        object.__setattr__(self, '_version', self._version + 1)
+        Curve._generation += 1
+
+    def _compile(self, x, compiler):
+        if type(self).__call__ is not Curve.__call__:
+            return compiler.var(f"{compiler.const(self)}({x})")
+
+        if self._op == '@':
+            x = compiler.emit(self._other, x)
+
+        if self.curve is None or isinstance(self.curve, str):
+            y = x
+        elif callable(self.curve):
+            y = compiler.emit(self.curve, x)
+        else:
+            y = compiler.const(self.curve)
+
+        if self._op and not self._op == '@':
+            y = compiler.apply(self._op, self._other, x, y)
+
+        for op, other in self._inplace_ops:
+            y = compiler.apply(op, other, x, y)
+
+        if self.id and type(self).logger is not no_logging:
+            i = compiler.const(self.id)
+            compiler.line(
+                f"_Curve.logger(_Record('{{}} = {{}}({{}})', {y}, {i}, {x}))")
+        return y
+
     def _repr(self, /, *, sep=''):
         if self.curve is None:
             s = f"{self.__class__.__name__}()"
@@ -276,6 +704,8 @@ class Curve:
 
     def __call__(self, x):
         if not isinstance(x, (int, float)):
+            if not callable(x) and isinstance(x, (list, tuple, array)):
+                return self.eval_many(x)
             return self @ x
 
         if self._op == '@':
@@ -283,6 +713,8 @@ class Curve:
 
         if self.curve is None or isinstance(self.curve, str):
             y = x
+        elif callable(self.curve) and type(x) is Dual:
+            y = _dual_call(self.curve, x)
         elif callable(self.curve):
             y = self.curve(x)
         else:
@@ -295,10 +727,160 @@ class Curve:
         for op, other in self._inplace_ops:
             y = self._apply(op, other, x, y)
 
-        if self.id:
-            self.logger(f"{y} = {self.id}({x})")
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} = {}({})", y, self.id, x))
         return y
 
+    def eval_many(self, x_list):
+        """evaluate curve at many points at once
+
+        :param x_list: (iterable) points to evaluate the curve at,
+            e.g. a list, a tuple or an **array**
+        :return: list of curve values
+
+        The expression tree of the curve is walked only once
+        and each operation is applied to the whole vector of values.
+        Inner callables are evaluated per point
+        unless they provide a **eval_many** method, too.
+
+        >>> from curves import X
+        >>> from curves.functions import exp
+
+        >>> p = 2 * X ** 2 + 3 * X + 1
+        >>> p.eval_many([0., 1., 2.])
+        [1.0, 6.0, 15.0]
+
+        >>> p([0., 1., 2.])
+        [1.0, 6.0, 15.0]
+
+        >>> (exp @ (X - 1)).eval_many((1, 2))
+        [1.0, 2.718281828459045]
+
+        """
+        if type(self).__call__ is not Curve.__call__:
+            return [self(x) for x in x_list]
+
+        x_list = list(x_list)
+        if self._op == '@':
+            x_list = _eval_many(self._other, x_list)
+
+        if self.curve is None or isinstance(self.curve, str):
+            y_list = x_list
+        elif callable(self.curve) and not isinstance(self.curve, Curve) \
+                and x_list and type(x_list[0]) is Dual:
+            y_list = [_dual_call(self.curve, x) for x in x_list]
+        elif callable(self.curve):
+            y_list = _eval_many(self.curve, x_list)
+        else:
+            y_list = [self.curve] * len(x_list)
+
+        if self._op and not self._op == '@':
+            op, other = self._op, self._other
+            y_list = self._apply_many(op, other, x_list, y_list)
+
+        for op, other in self._inplace_ops:
+            y_list = self._apply_many(op, other, x_list, y_list)
+
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} = {}({})", y_list, self.id, x_list))
+        return y_list
+
+    def compile(self):
+        """compile curve into a single flat function
+
+        :return: function evaluating the curve
+
+        The whole expression tree, i.e. operations, compositions and
+        in-place operations of all nested curves,
+        is turned into one generated function
+        without any dispatch at call time.
+
+        Any modification of a curve in the tree,
+        e.g. of its **curve** attribute or by in-place operations,
+        invalidates compiled functions,
+        which are then compiled again on the next call.
+
+        >>> from curves import X
+        >>> from curves.functions import exp
+
+        >>> p = exp @ (2 * X ** 2 + 3 * X + 1) / X
+        >>> f = p.compile()
+        >>> f(0.5) == p(0.5)
+        True
+
+        >>> p += X
+        >>> f(0.5) == p(0.5)
+        True
+
+        """
+        compiled = getattr(self, '_compiled', None)
+        logging = type(self).logger is not no_logging
+        if compiled is None or not compiled.logging == logging \
+                or not compiled.stamp.valid():
+            compiled = _Compiler().build(self)
+            object.__setattr__(self, '_compiled', compiled)
+        if not Curve._profiling:
+            compiled.__globals__['_generation'] = compiled.stamp.generation
+        return compiled
+
+    def cached(self=_DECORATE, maxsize=128, ttl=None):
+        """curve caching values of least recently used points
+
+        :param maxsize: (int) maximum number of cached values
+            (optional, default is 128), if **None** the cache is unbounded
+        :param ttl: (float) seconds a value stays valid (optional)
+        :return: |Curve| evaluating **self** only at uncached points
+
+        Any modification of **self**, i.e. of any curve or interpolation
+        **self** depends on, clears the cache.
+        Cache statistics are available as in :func:`functools.lru_cache`
+        by **cache_info()** and **cache_clear()**.
+
+        >>> from curves import X, Integral
+        >>> c = Curve(Integral(X)).cached(maxsize=2)
+        >>> c(1), c(1), c(2)
+        (0.5, 0.5, 2.0)
+        >>> c.cache_info()
+        {'hits': 1, 'misses': 2, 'maxsize': 2, 'currsize': 2}
+
+        Modifications of the caching curve itself keep the cache.
+
+        >>> c += 1
+        >>> c(1)
+        1.5
+        >>> c.cache_info()
+        {'hits': 2, 'misses': 2, 'maxsize': 2, 'currsize': 2}
+
+        Use it as a decorator on expensive functions, too.
+
+        >>> @Curve.cached
+        ... def price(x):
+        ...     return x * x
+        >>> price(2.0)
+        4.0
+
+        >>> @Curve.cached(maxsize=10, ttl=60)
+        ... def price(x):
+        ...     return x * x
+        >>> price(2.0), price.cache_info()['maxsize']
+        (4.0, 10)
+
+        >>> @Curve.cached(None)
+        ... def price(x):
+        ...     return x * x
+        >>> price(2.0), price.cache_info()['maxsize']
+        (4.0, None)
+
+        Caches are thread-safe.
+
+        """
+        if not callable(self):
+            # parametrised decorator, e.g. @Curve.cached(maxsize=10)
+            if self is not _DECORATE:
+                maxsize = self
+            return lambda curve: Curve.cached(curve, maxsize, ttl)
+        return _CachedCurve(_LRUCache(self, maxsize, ttl))
+
     def __eq__(self, other):
         return (repr(self) == repr(other)
                 and str(self) == str(other)
@@ -307,16 +889,23 @@ class Curve:
 
     def __copy__(self):
         new = self.__class__(self.curve, _op=self._op, _other=self._other)
-        new._inplace_ops = list(self._inplace_ops)
+        if self._inplace_ops:
+            # a new curve does not invalidate anything
+            object.__setattr__(new, '_inplace_ops', list(self._inplace_ops))
         return new
 
+    def __getstate__(self):
+        # compiled functions are not picklable but rebuilt on demand
+        slots = ('curve', 'id', '_op', '_other', '_inplace_ops', '_version')
+        return None, {key: getattr(self, key) for key in slots}
+
     def __int__(self):
         y = int(self.curve)
         if self._op or self._inplace_ops:
             raise RuntimeError("Type casting does not work"
                                " with assigned Operations.")
-        if self.id:
-            self.logger(f"{y} = int({self.id})")
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} = int({})", y, self.id))
         return y
 
     def __float__(self):
@@ -324,8 +913,8 @@ class Curve:
         if self._op or self._inplace_ops:
             raise RuntimeError("Type casting does not work "
                                "with assigned Operations.")
-        if self.id:
-            self.logger(f"{y} = float({self.id})")
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} = float({})", y, self.id))
         return y
 
     def __str__(self):
@@ -375,62 +964,90 @@ class Curve:
         return self.__class__(other).__matmul__(self)
 
     def __iadd__(self, other):
+        self._changed()
         if self._inplace_ops:
             op, oth = self._inplace_ops[-1]
             if op == '-' and oth == init(other):
                 self._inplace_ops.pop(-1)
                 return self
-        self._inplace_ops.append(('+', init(other)))
-        if self.id:
-            self.logger(f"{self.id} += {other}")
+        self._append('+', init(other))
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} += {}", self.id, other))
         return self
 
     def __isub__(self, other):
+        self._changed()
         if self._inplace_ops:
             op, oth = self._inplace_ops[-1]
             if op == '+' and oth == init(other):
                 self._inplace_ops.pop(-1)
                 return self
-        self._inplace_ops.append(('-', init(other)))
-        if self.id:
-            self.logger(f"{self.id} -= {other}")
+        self._append('-', init(other))
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} -= {}", self.id, other))
         return self
 
     def __imul__(self, other):
+        self._changed()
         if self._inplace_ops:
             op, oth = self._inplace_ops[-1]
             if op == '/' and oth == init(other):
                 self._inplace_ops.pop(-1)
                 return self
-        self._inplace_ops.append(('*', init(other)))
-        if self.id:
-            self.logger(f"{self.id} *= {other}")
+        self._append('*', init(other))
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} *= {}", self.id, other))
         return self
 
     def __itruediv__(self, other):
+        self._changed()
         if self._inplace_ops:
             op, oth = self._inplace_ops[-1]
             if op == '*' and oth == init(other):
                 self._inplace_ops.pop(-1)
                 return self
-        self._inplace_ops.append(('/', init(other)))
-        if self.id:
-            self.logger(f"{self.id} /= {other}")
+        self._append('/', init(other))
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} /= {}", self.id, other))
         return self
 
     def __ipow__(self, other):
-        self._inplace_ops.append(('**', other))
-        if self.id:
-            self.logger(f"{self.id} **= {other}")
+        self._changed()
+        self._append('**', other)
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} **= {}", self.id, other))
         return self
 
     def __imatmul__(self, other):
-        self._inplace_ops.append(('@', init(other)))
-        if self.id:
-            self.logger(f"{self.id} @= {other}")
+        self._changed()
+        self._append('@', init(other))
+        if self.id and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} @= {}", self.id, other))
         return self
 
+    def _append(self, op, other):
+        if not self._inplace_ops:
+            object.__setattr__(self, '_inplace_ops', [])
+        self._inplace_ops.append((op, other))
+
     def __setattr__(self, key, value):
-        if key == 'curve' and getattr(self, 'id', ''):
-            self.logger(f"{self.id} = {value}")
+        if key == 'curve' and getattr(self, 'id', '') \
+                and type(self).logger is not no_logging:
+            type(self).logger(_Record("{} = {}", self.id, value))
+        if hasattr(self, key):
+            self._changed()
         super().__setattr__(key, value)
+
+
+class _CachedCurve(Curve):
+    """curve of cached values (see |Curve.cached()|)"""
+
+    __slots__ = ()
+
+    def cache_info(self):
+        """dict of hits, misses, maxsize and currsize of cache"""
+        return self.curve.cache_info()
+
+    def cache_clear(self):
+        """clears cache and statistics"""
+        self.curve.cache_clear()
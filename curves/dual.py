@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+import math
+
+from .numerics import finite_difference, EPS
+
+
+class Dual(float):
+    r"""dual number $x + dx \cdot \varepsilon$ with $\varepsilon^2=0$
+
+    :param x: (float) value $x$
+    :param d: (float) derivative $dx$ (optional, default is 0.0)
+
+    A |Dual| is a float carrying a derivative along,
+    i.e. any arithmetic operation propagates value and derivative
+    in one pass (forward mode automatic differentiation).
+
+    >>> from curves.dual import Dual
+    >>> x = Dual(2.0, 1.0)
+    >>> x * x + 3 * x
+    Dual(10.0, 7.0)
+
+    As a float it runs through |Curve| objects, interpolations and
+    the functions of |curves.functions|.
+
+    >>> from curves import X
+    >>> from curves.functions import exp
+    >>> (exp @ (2 * X))(Dual(0.5, 1.0))
+    Dual(2.718281828459045, 5.43656365691809)
+
+    """
+    __slots__ = 'd',
+
+    def __new__(cls, x, d=0.0):
+        new = super().__new__(cls, x)
+        new.d = d
+        return new
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({float(self)!r}, {self.d!r})"
+
+    def __str__(self):
+        return repr(self)
+
+    def __neg__(self):
+        return Dual(-float(self), -self.d)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return self if 0 <= self else -self
+
+    def __add__(self, other):
+        if isinstance(other, Dual):
+            return Dual(float(self) + float(other), self.d + other.d)
+        if isinstance(other, (int, float)):
+            return Dual(float(self) + other, self.d)
+        return NotImplemented
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, Dual):
+            return Dual(float(self) - float(other), self.d - other.d)
+        if isinstance(other, (int, float)):
+            return Dual(float(self) - other, self.d)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        if isinstance(other, (int, float)):
+            return Dual(other - float(self), -self.d)
+        return NotImplemented
+
+    def __mul__(self, other):
+        x = float(self)
+        if isinstance(other, Dual):
+            y = float(other)
+            return Dual(x * y, self.d * y + x * other.d)
+        if isinstance(other, (int, float)):
+            return Dual(x * other, self.d * other)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        x = float(self)
+        if isinstance(other, Dual):
+            y = float(other)
+            return Dual(x / y, (self.d - x / y * other.d) / y)
+        if isinstance(other, (int, float)):
+            return Dual(x / other, self.d / other)
+        return NotImplemented
+
+    def __rtruediv__(self, other):
+        if isinstance(other, (int, float)):
+            x = float(self)
+            return Dual(other / x, -other / (x * x) * self.d)
+        return NotImplemented
+
+    def __pow__(self, power, modulo=None):
+        x = float(self)
+        if isinstance(power, Dual):
+            p = float(power)
+            y = x ** p
+            d = p * x ** (p - 1) * self.d + y * math.log(x) * power.d
+            return Dual(y, d)
+        if isinstance(power, (int, float)):
+            d = power * x ** (power - 1) * self.d if power else 0.0
+            return Dual(x ** power, d)
+        return NotImplemented
+
+    def __rpow__(self, other):
+        if isinstance(other, (int, float)):
+            y = other ** float(self)
+            return Dual(y, y * math.log(other) * self.d)
+        return NotImplemented
+
+
+# derivatives of elementary functions as curves or constants
+# (shared table, filled by curves.operators)
+_DERIVATIVES = {}
+
+
+def _call(f, x, h=EPS):
+    """evaluate **f** at dual number **x**"""
+    df = _DERIVATIVES.get(f) if getattr(f, '__hash__', None) else None
+    if df is not None:
+        a = float(x)
+        return Dual(f(a), (df(a) if callable(df) else df) * x.d)
+    y = f(x)
+    if isinstance(y, Dual):
+        return y
+    # opaque callable which does not propagate dual numbers
+    return Dual(y, finite_difference(f, float(x), h) * x.d)
+
+
+def exp(x):
+    """exponential function propagating dual numbers"""
+    return _call(math.exp, x) if type(x) is Dual else math.exp(x)
+
+
+def derivative(f, x, h=EPS):
+    """first derivative by forward mode automatic differentiation
+
+    :param f: (callable) function $f$
+    :param x: (float) point $x$
+    :param h: (float) step size for finite differences (optional)
+    :return: (float) derivative $f'(x)$
+
+    Callables which do not propagate |Dual| numbers
+    are differentiated by finite differences.
+
+    >>> from curves.dual import derivative
+    >>> from curves.interpolation import linear
+    >>> derivative(linear([0, 1], [0, 2]), 0.5)
+    2.0
+
+    """
+    return _call(f, Dual(x, 1.0), h).d
+
+
+def derivative_many(f, x_list):
+    """first derivatives at many points at once
+
+    :param f: (callable) function $f$
+    :param x_list: (iterable) points $x_1, \\dots, x_n$
+    :return: (list(float)) derivatives $f'(x_1), \\dots, f'(x_n)$
+
+    A |Curve| propagates the whole batch of |Dual| numbers
+    through its expression tree at once (see |Curve.eval_many()|).
+
+    >>> from curves import X
+    >>> from curves.dual import derivative_many
+    >>> derivative_many(X * X + 1, [0.0, 1.0, 2.0])
+    [0.0, 2.0, 4.0]
+
+    """
+    from .curves import Curve
+
+    x_list = [Dual(x, 1.0) for x in x_list]
+    if isinstance(f, Curve):
+        return [getattr(y, 'd', 0.0) for y in f.eval_many(x_list)]
+    return [_call(f, x).d for x in x_list]
@@ -10,16 +10,19 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
+from array import array
 from bisect import bisect_left, bisect_right
-from collections import UserDict
-from copy import copy
+from collections.abc import Mapping, MutableMapping
+from copy import copy, deepcopy
 from functools import partial
-from math import exp, log
+from itertools import accumulate
+from math import exp, expm1, log
 from reprlib import Repr
 # from typing import Dict, Iterable, Callable, Tuple
 
-from .curves import Curve as _Curve
-from .numerics import solve as _solve
+from .curves import Curve as _Curve, _eval_many
+from .dual import Dual as _Dual, exp as _dual_exp
+from .numerics import solve as _solve, inverse as _inverse, EPS
 
 
 TOL = 1e-10
@@ -38,8 +41,10 @@ def fit(curve,
         target_list=None,  # target_list: Iterable[float] | None = None,
         interpolation_type=None,  # interpolation_type: str | Callable | None = None,  # noqa E501
         method='secant_method',  # method; str | Callable = 'secant_method'
-        *args, **kwargs):  # ) -> Dict[float, float]:
-    """ fit according to calibration routine to target values
+        *args, incremental=False, jacobian=False,
+        initial_guess=None, executor=None,
+        **kwargs):  # ) -> Dict[float, float]:
+    r""" fit according to calibration routine to target values
 
     >>> from functools import partial
     >>> from math import exp
@@ -51,55 +56,318 @@ def fit(curve,
     >>> # equivalent to err_func = yc / 2 (see below)
 
     >>> fit(yc, grid, err_func, target_list=grid)
-    {1.0: 1.99..., 2.0: 3.99..., 3.0: 6.00..., 4.0: 8.00...}
+    {1.0: 2.0, 2.0: 4.0, 3.0: 6.0, 4.0: 8.0}
 
     >>> fit(yc, grid, yc / 2, target_list=grid)
-    {1.0: 1.99..., 2.0: 3.99..., 3.0: 6.00..., 4.0: 8.00...}
+    {1.0: 2.0, 2.0: 4.0, 3.0: 6.0, 4.0: 8.0}
+
+    With **incremental=True** values of a |Curve| **curve**
+    without the fitted addon are calculated only once per point
+    and reused during the whole calibration.
+    Hence, **err_func** evaluations of **curve** cost only
+    one lookup plus the local evaluation of the addon interpolation.
+    Already fitted points are not reused beyond that,
+    i.e. **err_func** still evaluates the whole addon.
+    So this pays off only for expensive curves,
+    e.g. given by an |Integral()|,
+    and may even slow down the fit of cheap ones.
+
+    >>> fit(yc, grid, yc / 2, target_list=grid, incremental=True)
+    {1.0: 2.0, 2.0: 4.0, 3.0: 6.0, 4.0: 8.0}
+
+    If each **err_func** depends only on its own grid point,
+    e.g. for **interpolation_type** 'constant' on disjoint intervals,
+    the root finding problems can be solved concurrently
+    by a :class:`concurrent.futures.Executor` given as **executor**.
+    Note, independence of the problems is not checked but
+    declared by providing an **executor**.
+    Each problem is solved on its own copy of **curve**
+    together with its **err_func**, i.e. **err_func** must refer to
+    **curve** by its attributes, like |Curve| expressions or
+    :func:`functools.partial` objects do, and not by a closure.
+    For a :class:`concurrent.futures.ProcessPoolExecutor`
+    both must be picklable.
+
+    >>> from concurrent.futures import ThreadPoolExecutor
+    >>> with ThreadPoolExecutor() as executor:
+    ...     fit(yc, grid, yc / 2, target_list=grid,
+    ...         interpolation_type='constant', executor=executor)
+    {1.0: 2.0, 2.0: 4.0, 3.0: 6.0, 4.0: 8.0}
+
+    To fit many curves concurrently see |fit_many()|.
+
+    With **jacobian=True** the sensitivities of the fitted values
+    to **target_list** are returned, too.
+    By the implicit function theorem these are given by the inverse
+    of the derivatives of **err_func** with respect to fitted values
+    at the solution. So no refitting of bumped targets is required.
+
+    >>> fitted, jac = fit(yc, grid, yc / 2, target_list=grid, jacobian=True)
+    >>> [round(d, 6) for d in jac[0]]
+    [2.0, 0.0, 0.0, 0.0]
+
+    The rows of **jac** are given by grid point and
+    the columns by target, i.e. $\frac{\partial y_i}{\partial v_j}$
+    is **jac[i][j]**.
+
+    For 'secant_method' and 'newton_raphson' root finding
+    starts at the solution of the previous grid point
+    (unless initial values are given explicitly).
+    Moreover, a dict of fitted values as **initial_guess**,
+    e.g. of a previous calibration, seeds root finding at grid points.
+
+    >>> fit(yc, grid, yc / 2, target_list=grid, initial_guess=fitted)
+    {1.0: 2.0..., 2.0: 4.0..., 3.0: 6.0..., 4.0: 8.0...}
 
     """  # noqa E501
     grid = tuple(grid)
-    if callable(err_func):
-        err_func = [partial(err_func, x) for x in grid]
-    if target_list is None:
-        target_list = [0.0] * len(grid)
-    if interpolation_type is None:
-        func = piecewise_linear
-    elif isinstance(interpolation_type, str):
-        func = globals()[interpolation_type]
-    else:
-        func = interpolation_type
+    func = _interpolation_type(interpolation_type)
 
     # check iadd/isub of curve
     if not isinstance(curve, _Curve):
-        _curve = copy(curve)
-        _val = 0.01
-        _addon = func(grid, [_val] * len(grid))
-        _vals = {x: _curve(x) for x in grid}
-        _curve += _addon
-        _vals2 = [abs(_curve(x) - _val - v) for x, v in _vals.items()]
-        _curve -= _addon
-        _vals3 = [abs(_curve(x) - v) for x, v in _vals.items()]
-
-        if max(_vals2) + max(_vals3) < TOL:
-            msg = (f"fit requires proper inplace add and sub of curves "
-                   f"but failed for {curve}")
-            raise TypeError(msg)
+        _check_inplace(curve, grid, func)
+
+    return _fit(curve, grid, err_func, target_list, func, method, args,
+                incremental, jacobian, initial_guess, kwargs, executor)
+
+
+def _fit(curve, grid, err_func, target_list, func, method, args,
+         incremental=False, jacobian=False, initial_guess=None, kwargs=None,
+         executor=None):
+    kwargs = kwargs or {}
+    err_func = _err_funcs(err_func, grid)
+    if target_list is None:
+        target_list = [0.0] * len(grid)
+
+    # cache values of curve without addon
+    state = None
+    if incremental and isinstance(curve, _Curve):
+        state = curve.curve, curve._op, curve._other, curve._inplace_ops
+        curve.curve = _memo(copy(curve))
+        curve._op = curve._other = None
+        curve._inplace_ops = ()
 
     # move on to curve fitting
     addon = func(grid, [0.0] * len(grid))
     curve += addon
-    for t, f, v in zip(grid, err_func, target_list):
-        # set error function
-        def err(current):
-            addon[t] = current
-            return f() - v
-        # run root finding
-        _solve(err, method, *args, **kwargs)
-
-    curve -= addon
+    initial_guess = initial_guess or {}
+    matrix = None
+    try:
+        if executor is None:
+            seed = None
+            for t, f, v in zip(grid, err_func, target_list):
+                seed = initial_guess.get(t, seed)
+                kw = _warm_start(method, seed, args, kwargs)
+                seed = _fit_point(addon, t, f, v, method, args, kw)
+        else:
+            futures = []
+            for t, f, v in zip(grid, err_func, target_list):
+                kw = _warm_start(method, initial_guess.get(t), args, kwargs)
+                futures.append(executor.submit(
+                    _fit_copy, curve, addon, t, f, v, method, args, kw))
+            for t, future in zip(grid, futures):
+                addon[t] = future.result()
+        if jacobian:
+            matrix = _inverse(_jacobian(addon, grid, err_func))
+    finally:
+        curve -= addon
+        if state:
+            curve.curve, curve._op, curve._other, curve._inplace_ops = state
+    if jacobian:
+        return dict(addon.items()), matrix
     return dict(addon.items())
 
 
+def fit_many(curves,
+             grid,  # grid: Iterable[float],
+             err_funcs,  # err_funcs: Iterable[Callable | Iterable[Callable]],
+             target_lists=None,  # target_lists: Iterable[Iterable[float]] | None = None,  # noqa E501
+             interpolation_type=None,  # interpolation_type: str | Callable | None = None,  # noqa E501
+             method='secant_method',  # method; str | Callable = 'secant_method'  # noqa E501
+             *args, executor=None,
+             **kwargs):  # ) -> List[Dict[float, float]]:
+    """ fit many curves on the same grid according to calibration routine
+
+    Same as |fit()| but for a list of **curves** with
+    **err_funcs** and **target_lists** given for each curve.
+    Grid and interpolation setup as well as checks are done only once.
+
+    If an :class:`concurrent.futures.Executor` is given as **executor**,
+    each curve is fitted in the executor pool.
+    Curves must not share nodes then.
+    For a :class:`concurrent.futures.ProcessPoolExecutor`,
+    curves and **err_funcs** must be picklable
+    and fitted values are returned without changing **curves**.
+
+    >>> from curves import Curve, fit_many
+
+    >>> yc, zc = Curve(0.0), Curve(1.0)
+    >>> grid = 1, 2, 3, 4
+    >>> fit_many([yc, zc], grid, [yc / 2, zc / 4], target_lists=[grid, grid])
+    [{1.0: 2.0, 2.0: 4.0, 3.0: 6.0, 4.0: 8.0}, {1.0: 3.0, 2.0: 7.0, 3.0: 11.0, 4.0: 15.0}]
+
+    """  # noqa E501
+    curves = tuple(curves)
+    grid = tuple(grid)
+    if target_lists is None:
+        target_lists = [None] * len(curves)
+    func = _interpolation_type(interpolation_type)
+
+    # check iadd/isub of curves
+    for curve in {type(curve): curve for curve in curves
+                  if not isinstance(curve, _Curve)}.values():
+        _check_inplace(curve, grid, func)
+
+    fits = [partial(_fit, curve, grid, err_func, target_list,
+                    func, method, args, kwargs=kwargs)
+            for curve, err_func, target_list
+            in zip(curves, err_funcs, target_lists)]
+    if executor is None:
+        return [f() for f in fits]
+    futures = [executor.submit(f) for f in fits]
+    return [future.result() for future in futures]
+
+
+def _err_funcs(err_func, grid):
+    if callable(err_func):
+        return [partial(err_func, x) for x in grid]
+    return err_func
+
+
+def _interpolation_type(interpolation_type):
+    if interpolation_type is None:
+        return piecewise_linear
+    if isinstance(interpolation_type, str):
+        return globals()[interpolation_type]
+    return interpolation_type
+
+
+def _check_inplace(curve, grid, func):
+    _curve = copy(curve)
+    _val = 0.01
+    _addon = func(grid, [_val] * len(grid))
+    _vals = {x: _curve(x) for x in grid}
+    _curve += _addon
+    _vals2 = [abs(_curve(x) - _val - v) for x, v in _vals.items()]
+    _curve -= _addon
+    _vals3 = [abs(_curve(x) - v) for x, v in _vals.items()]
+
+    if TOL < max(_vals2) + max(_vals3):
+        msg = (f"fit requires proper inplace add and sub of curves "
+               f"but failed for {curve}")
+        raise TypeError(msg)
+
+
+def _jacobian(addon, grid, err_func):
+    # derivatives of err_func by fitted values (central differences)
+    columns = []
+    for t in grid:
+        y = addon[t]
+        addon[t] = y + EPS
+        up = [f() for f in err_func]
+        addon[t] = y - EPS
+        down = [f() for f in err_func]
+        addon[t] = y
+        columns.append([(u - d) / (2 * EPS) for u, d in zip(up, down)])
+    return [list(row) for row in zip(*columns)]
+
+
+def _warm_start(method, seed, args, kwargs):
+    # initial values of root finding next to seed
+    if seed is None or args or not isinstance(method or '', str):
+        return kwargs
+    if any(k in kwargs for k in ('a', 'b', 'bounds', 'guess')):
+        return kwargs
+    method = method or 'secant_method'
+    if 'newton' in method:
+        return dict(kwargs, a=seed)
+    if 'secant' in method:
+        return dict(kwargs, a=seed, b=seed + 1e-3 * (1 + abs(seed)))
+    return kwargs
+
+
+def _fit_point(addon, t, f, v, method, args, kwargs):
+    # set error function
+    def err(current):
+        addon[t] = current
+        return f() - v
+    # run root finding
+    root = addon[t] = _solve(err, method, *args, **kwargs)
+    return root
+
+
+def _fit_copy(curve, addon, t, f, v, method, args, kwargs):
+    # solve on copies of curve, addon and error function sharing nodes
+    curve, addon, f = deepcopy((curve, addon, f))
+    return _fit_point(addon, t, f, v, method, args, kwargs)
+
+
+class _memo(dict):
+    """function values cache"""
+
+    def __init__(self, func):
+        super().__init__()
+        self.func = func
+        self.__name__ = getattr(func, '__name__', repr(func))
+
+    def __missing__(self, x):
+        y = self[x] = self.func(x)
+        return y
+
+    def __call__(self, x):
+        if isinstance(x, (int, float)):
+            return self[x]
+        return self.func(x)
+
+
+def _search(bisect, xs, x_list, lo=0, hi=0):
+    """bisect positions of all **x_list** items in **xs**
+
+    For ascending **x_list** items the search range shrinks
+    to the right of the previous position.
+    **hi** is counted from the end of **xs**.
+    """
+    hi += len(xs)
+    start, last, positions = lo, None, []
+    for x in x_list:
+        if last is None or x < last:
+            start = lo
+        start = bisect(xs, x, start, hi)
+        positions.append(start)
+        last = x
+    return positions
+
+
+def _const(x, y):
+    # value y constant in x, i.e. with zero derivative for dual numbers
+    if type(x) is _Dual and isinstance(y, (int, float)):
+        return _Dual(y, 0.0)
+    return y
+
+
+def _integral(self, a, b):
+    r"""closed form integral
+
+    :param a: (float) lower bound $a$
+    :param b: (float) upper bound $b$
+    :return: (float) integral $\int_a^b f(x) dx$
+
+    Integrals between knots are summed up once
+    (until next modification).
+    So any further integral is exact and costs only two bisects.
+
+    |Integral()| uses this instead of numerical quadrature.
+
+    >>> from curves.interpolation import linear, left
+    >>> linear([1, 2, 3], [1, 2, 1]).integral(0, 4)
+    4.0
+    >>> left([1, 2, 3], [1, 2, 1]).integral(1.5, 3.5)
+    3.0
+
+    """
+    return self._primitive(b) - self._primitive(a)
+
+
 class plist(list):
     """pretty print list"""
 
@@ -107,18 +375,25 @@ class plist(list):
         return _repr.repr(list(self))
 
 
-class base_interpolation(UserDict):
+class base_interpolation(MutableMapping):
     """
     Basic class to interpolate given data.
     """
 
+    _version = 0  # stamp of knots and values
+
     @property
     def x_list(self):
-        return plist(self.keys())
+        return plist(self._xs)
 
     @property
     def y_list(self):
-        return plist(self.values())
+        return plist(self._ys)
+
+    @property
+    def data(self):
+        # copy of knots and values (which are stored in arrays only)
+        return dict(zip(self._xs, self._ys))
 
     def __init__(self, x_list=(), y_list=()):
         r""" interpolation class
@@ -136,11 +411,20 @@ class base_interpolation(UserDict):
         if isinstance(x_list, dict) and not y_list:
             y_list = x_list.values()
             x_list = x_list.keys()
-        super().__init__(zip(map(float, x_list), map(float, y_list)))
+        # sorted knots and values are kept in arrays of unboxed floats
+        self._xs, self._ys = array('d'), array('d')
+        self.update_many(x_list, y_list)
 
     def __copy__(self):
-        cls = self.__class__
-        return cls(self.x_list, self.y_list)
+        # copy knots and values as stored and rebuild derived data
+        new = self.__class__.__new__(self.__class__)
+        new.__dict__.update(self.__dict__)
+        new._xs, new._ys = array('d', self._xs), array('d', self._ys)
+        new._prepare()
+        return new
+
+    def copy(self):
+        return self.__copy__()
 
     def __str__(self):
         cls = self.__class__.__name__
@@ -151,11 +435,199 @@ class base_interpolation(UserDict):
         return f"{cls}({self.x_list!r}, {self.y_list!r})"
 
     def __call__(self, x):
-        return float(x)
+        return x if type(x) is _Dual else float(x)
+
+    def eval_many(self, x_list):
+        """evaluate interpolation at many points at once
+
+        :param x_list: (iterable) points to evaluate the interpolation at,
+            e.g. a list, a tuple or an **array**
+        :return: list of values
+
+        Same as calling the interpolation with a sequence.
+
+        >>> from curves.interpolation import linear
+        >>> c = linear([1, 2, 3], [2, 3, 4])
+        >>> c.eval_many([0, 1.5, 4])
+        [1.0, 2.5, 5.0]
+        >>> c((0, 1.5, 4))
+        [1.0, 2.5, 5.0]
+
+        """
+        return [self(x) for x in x_list]
+
+    def _dispatch(self, x):
+        # non float argument
+        if hasattr(x, '__iter__'):
+            return self.eval_many(x)
+        return self(float(x))
+
+    def _index(self, key):
+        """index of knot **key** or -1 if **key** is not a knot"""
+        xs = self._xs
+        try:
+            i = bisect_left(xs, key)
+        except TypeError:
+            return -1
+        return i if i < len(xs) and xs[i] == key else -1
+
+    def __len__(self):
+        return len(self._xs)
+
+    def __iter__(self):
+        return iter(self._xs)
+
+    def __contains__(self, key):
+        return 0 <= self._index(key)
+
+    def __getitem__(self, key):
+        i = self._index(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._ys[i]
 
     def __setitem__(self, key, value):
-        super().__setitem__(float(key), float(value))
-        self.data = dict(sorted(self.data.items()))
+        key, value = float(key), float(value)
+        xs = self._xs
+        i = bisect_left(xs, key)
+        if i < len(xs) and xs[i] == key:
+            self._ys[i] = value
+            size = 0
+        else:
+            xs.insert(i, key)
+            self._ys.insert(i, value)
+            size = 1
+        self._update(i, size)
+
+    def __delitem__(self, key):
+        i = self._index(key)
+        if i < 0:
+            raise KeyError(key)
+        self._xs.pop(i)
+        self._ys.pop(i)
+        self._update(i, -1)
+
+    def __or__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        new = self.copy()
+        new.update(other)
+        return new
+
+    def __ror__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        new = self.__class__(other)
+        new.update(self)
+        return new
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update_many(self, x_list, y_list):
+        r"""set many points at once
+
+        :param x_list: points $x_1 \dots x_n$
+        :param y_list: values $y_1 \dots y_n$
+
+        Unlike setting points one by one,
+        knots are sorted only once.
+
+        >>> from curves.interpolation import linear
+        >>> c = linear([1, 3], [1, 3])
+        >>> c.update_many([4, 0, 2], [4, 0, 4])
+        >>> c
+        linear([0.0, 1.0, 2.0, 3.0, 4.0], [0.0, 1.0, 4.0, 3.0, 4.0])
+
+        """
+        data = dict(zip(self._xs, self._ys))
+        data.update(zip(map(float, x_list), map(float, y_list)))
+        items = sorted(data.items())
+        self._xs = array('d', (x for x, _ in items))
+        self._ys = array('d', (y for _, y in items))
+        self._prepare()
+
+    def _prepare(self):
+        """rebuild any data derived from knots and values"""
+        self._cum = None
+        self._version += 1
+        _Curve._updated()
+
+    def _update(self, i, size=0):
+        """update data derived from knots and values at index **i**
+
+        **size** is 1 if a new point was inserted at **i**,
+        -1 if a point was removed at **i** and 0 if a value was changed.
+        """
+        self._cum = None
+        self._version += 1
+        _Curve._updated()
+
+    integral = None  # closed form only along with _primitive
+
+    def _cumulative(self):
+        # integrals from the first knot to any knot
+        if self._cum is None:
+            segments = map(self._segment, range(len(self._xs)))
+            self._cum = array('d', accumulate(segments))
+        return self._cum
+
+    def _segment(self, i):
+        # integral between knots i - 1 and i
+        return 0.0
+
+    def gradient(self, x):
+        r"""sensitivities of value at $x$ to values at knots
+
+        :param x: (float) point $x$
+        :return: (dict) partial derivatives
+            $\frac{\partial f(x)}{\partial y_i}$ by knot $x_i$
+
+        Only non-zero derivatives are given,
+        i.e. at most two for linear interpolations.
+
+        >>> from curves.interpolation import linear
+        >>> c = linear([1, 2, 3], [2, 3, 4])
+        >>> c.gradient(1.5)
+        {1.0: 0.5, 2.0: 0.5}
+
+        """
+        return self.gradient_many((x,))[0]
+
+    def gradient_many(self, x_list):
+        r"""sensitivities of values at many points at once
+
+        :param x_list: (iterable) points $x$
+        :return: (list(dict)) partial derivatives
+            $\frac{\partial f(x)}{\partial y_i}$ by knot $x_i$
+            for any point $x$
+
+        >>> from curves.interpolation import linear
+        >>> c = linear([1, 2, 3], [2, 3, 4])
+        >>> c.gradient_many([0, 2.5])
+        [{1.0: 2.0, 2.0: -1.0}, {2.0: 0.5, 3.0: 0.5}]
+
+        Interpolations without closed form weights
+        bump and revalue any knot value on a copy.
+
+        """
+        xs = self._xs
+        return [{xs[i]: w for i, w in weights}
+                for weights in self._weights(x_list)]
+
+    def _weights(self, x_list):
+        # pairs of knot index and weight of its value at any point
+        x_list = tuple(x_list)
+        values, bumped = self.eval_many(x_list), self.__copy__()
+        weights = [[] for _ in x_list]
+        for i, (x, y) in enumerate(self.items()):
+            bumped[x] = y + EPS
+            for w, v, b in zip(weights, values, bumped.eval_many(x_list)):
+                if not v == b:
+                    w.append((i, (b - v) / EPS))
+            bumped[x] = y
+        return [tuple(w) for w in weights]
 
     def _op(self, other, attr):
         new = self.__copy__()
@@ -201,12 +673,31 @@ class flat(base_interpolation):
         super(flat, self).__init__([0.0], [y])
 
     def __call__(self, x):
-        return self.y_list[0]
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
+        return _const(x, self._ys[0])
+
+    def eval_many(self, x_list):
+        return [self._ys[0]] * len(tuple(x_list))
+
+    integral = _integral
+
+    def _primitive(self, x):
+        return self._ys[0] * x
+
+    def _weights(self, x_list):
+        return [((0, 1.0),) for _ in x_list]
 
 
 class identity(base_interpolation):
 
-    pass
+    integral = _integral
+
+    def _primitive(self, x):
+        return 0.5 * x * x
+
+    def _weights(self, x_list):
+        return [() for _ in x_list]
 
 
 class _default_value_interpolation(base_interpolation):
@@ -239,14 +730,23 @@ class _default_value_interpolation(base_interpolation):
         super().__init__(x_list, y_list)
 
     def __call__(self, x):
-        if x not in self.x_list:
-            return self._default
-        return self.y_list[self.x_list.index(x)]
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
+        i = self._index(x)
+        return _const(x, self._default if i < 0 else self._ys[i])
 
-    def __copy__(self):
-        cls = self.__class__
-        return cls(self.x_list, self.y_list,
-                   default_value=self._default)
+    def eval_many(self, x_list):
+        index, ys, default = self._index, self._ys, self._default
+        return [default if i < 0 else ys[i] for i in map(index, x_list)]
+
+    integral = _integral
+
+    def _primitive(self, x):
+        return self._default * x
+
+    def _weights(self, x_list):
+        return [((i, 1.0),) if 0 <= i else ()
+                for i in map(self._index, x_list)]
 
     def __str__(self):
         cls = self.__class__.__name__
@@ -283,6 +783,8 @@ class no(_default_value_interpolation):
         """
         super().__init__(x_list, y_list)
 
+    integral = None
+
 
 class zero(_default_value_interpolation):
     def __init__(self, x_list=(), y_list=()):
@@ -342,14 +844,39 @@ class left(base_interpolation):
         super().__init__(x_list, y_list)
 
     def __call__(self, x):
-        if len(self.y_list) == 0:
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
+        xs, ys = self._xs, self._ys
+        if not ys:
             raise OverflowError
-        if x in self.x_list:
-            i = self.x_list.index(x)
-        else:
-            i = bisect_left(self.x_list, float(x), 1,
-                            len(self.x_list)) - 1
-        return self.y_list[i]
+        return _const(x, ys[bisect_right(xs, float(x), 1, len(xs)) - 1])
+
+    def eval_many(self, x_list):
+        xs, ys = self._xs, self._ys
+        if not ys:
+            raise OverflowError
+        x_list = tuple(map(float, x_list))
+        return [ys[i - 1] for i in _search(bisect_right, xs, x_list, 1)]
+
+    def _segment(self, i):
+        xs, ys = self._xs, self._ys
+        return ys[i - 1] * (xs[i] - xs[i - 1]) if i else 0.0
+
+    integral = _integral
+
+    def _primitive(self, x):
+        xs, ys = self._xs, self._ys
+        if not ys:
+            raise OverflowError
+        i = bisect_right(xs, x, 1, len(xs)) - 1
+        return self._cumulative()[i] + ys[i] * (x - xs[i])
+
+    def _weights(self, x_list):
+        xs = self._xs
+        if not xs:
+            raise OverflowError
+        x_list = tuple(map(float, x_list))
+        return [((i - 1, 1.0),) for i in _search(bisect_right, xs, x_list, 1)]
 
 
 class constant(left):
@@ -393,14 +920,40 @@ class right(base_interpolation):
         super().__init__(x_list, y_list)
 
     def __call__(self, x):
-        if len(self.y_list) == 0:
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
+        xs, ys = self._xs, self._ys
+        if not ys:
             raise OverflowError
-        if x in self.x_list:
-            i = self.x_list.index(x)
-        else:
-            i = bisect_right(self.x_list, float(x), 0,
-                             len(self.x_list) - 1)
-        return self.y_list[i]
+        return _const(x, ys[bisect_left(xs, float(x), 0, len(xs) - 1)])
+
+    def eval_many(self, x_list):
+        xs, ys = self._xs, self._ys
+        if not ys:
+            raise OverflowError
+        x_list = tuple(map(float, x_list))
+        return [ys[i] for i in _search(bisect_left, xs, x_list, 0, -1)]
+
+    def _segment(self, i):
+        xs, ys = self._xs, self._ys
+        return ys[i] * (xs[i] - xs[i - 1]) if i else 0.0
+
+    integral = _integral
+
+    def _primitive(self, x):
+        xs, ys = self._xs, self._ys
+        if not ys:
+            raise OverflowError
+        i = bisect_left(xs, x, 0, len(xs) - 1)
+        return self._cumulative()[i] - ys[i] * (xs[i] - x)
+
+    def _weights(self, x_list):
+        xs = self._xs
+        if not xs:
+            raise OverflowError
+        x_list = tuple(map(float, x_list))
+        positions = _search(bisect_left, xs, x_list, 0, -1)
+        return [((i, 1.0),) for i in positions]
 
 
 class nearest(base_interpolation):
@@ -435,18 +988,42 @@ class nearest(base_interpolation):
         super().__init__(x_list, y_list)
 
     def __call__(self, x):
-        if len(self.y_list) == 0:
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
+        xs, ys = self._xs, self._ys
+        if not ys:
             raise OverflowError
-        if len(self.y_list) == 1:
-            return self.y_list[0]
-        if x in self.x_list:
-            i = self.x_list.index(x)
-        else:
-            i = bisect_left(self.x_list, float(x), 1, len(self.x_list) - 1)
-            if (self.x_list[i - 1] - x) / (self.x_list[i - 1] -
-                                           self.x_list[i]) <= 0.5:
-                i -= 1
-        return self.y_list[i]
+        if len(ys) == 1:
+            return _const(x, ys[0])
+        i = bisect_left(xs, float(x), 1, len(xs) - 1)
+        if (xs[i - 1] - x) / (xs[i - 1] - xs[i]) <= 0.5:
+            i -= 1
+        return _const(x, ys[i])
+
+    def eval_many(self, x_list):
+        xs, ys = self._xs, self._ys
+        if not ys:
+            raise OverflowError
+        x_list = tuple(map(float, x_list))
+        if len(ys) == 1:
+            return [ys[0]] * len(x_list)
+        positions = _search(bisect_left, xs, x_list, 1, -1)
+        return [ys[i - 1] if (xs[i - 1] - x) / (xs[i - 1] - xs[i]) <= 0.5
+                else ys[i] for x, i in zip(x_list, positions)]
+
+    integral = None
+
+    def _weights(self, x_list):
+        xs = self._xs
+        if not xs:
+            raise OverflowError
+        x_list = tuple(map(float, x_list))
+        if len(xs) == 1:
+            return [((0, 1.0),)] * len(x_list)
+        positions = _search(bisect_left, xs, x_list, 1, -1)
+        return [((i - 1, 1.0),)
+                if (xs[i - 1] - x) / (xs[i - 1] - xs[i]) <= 0.5
+                else ((i, 1.0),) for x, i in zip(x_list, positions)]
 
 
 class linear(base_interpolation):
@@ -479,14 +1056,80 @@ class linear(base_interpolation):
         """
         super().__init__(x_list, y_list)
 
+    def _slope(self, i):
+        # slope between points i - 1 and i
+        if not i:
+            return 0.0
+        xs, ys = self._xs, self._ys
+        return (ys[i] - ys[i - 1]) / (xs[i] - xs[i - 1])
+
+    def _prepare(self):
+        super()._prepare()
+        self._dy = array('d', map(self._slope, range(len(self._xs))))
+
+    def _update(self, i, size=0):
+        super()._update(i, size)
+        dy = self._dy
+        if 0 < size:
+            dy.insert(i, 0.0)
+        if size < 0:
+            dy.pop(i)
+        for j in range(i, min(i + 2, len(dy))):
+            dy[j] = self._slope(j)
+
     def __call__(self, x):
-        if len(self.y_list) == 0:
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
+        xs, ys = self._xs, self._ys
+        if not ys:
+            raise OverflowError(f'x_list={self.x_list} y_list={self.y_list}')
+        if len(ys) == 1:
+            return _const(x, ys[0])
+        i = bisect_left(xs, float(x), 1, len(xs) - 1)
+        return ys[i - 1] + self._dy[i] * (x - xs[i - 1])
+
+    def eval_many(self, x_list):
+        xs, ys, dy = self._xs, self._ys, self._dy
+        if not ys:
+            raise OverflowError(f'x_list={self.x_list} y_list={self.y_list}')
+        x_list = tuple(map(float, x_list))
+        if len(ys) == 1:
+            return [ys[0]] * len(x_list)
+        positions = _search(bisect_left, xs, x_list, 1, -1)
+        return [ys[i - 1] + dy[i] * (x - xs[i - 1])
+                for x, i in zip(x_list, positions)]
+
+    def _segment(self, i):
+        return self._area(i, self._xs[i]) if i else 0.0
+
+    def _area(self, i, x):
+        # integral from knot i - 1 to x along line through knot i - 1 and i
+        d = x - self._xs[i - 1]
+        return (self._ys[i - 1] + 0.5 * self._dy[i] * d) * d
+
+    integral = _integral
+
+    def _primitive(self, x):
+        xs, ys = self._xs, self._ys
+        if not ys:
             raise OverflowError(f'x_list={self.x_list} y_list={self.y_list}')
-        if len(self.y_list) == 1:
-            return self.y_list[0]
-        i = bisect_left(self.x_list, float(x), 1, len(self.x_list) - 1)
-        return self.y_list[i - 1] + (self.y_list[i] - self.y_list[i - 1]) * \
-            (self.x_list[i - 1] - x) / (self.x_list[i - 1] - self.x_list[i])
+        if len(ys) == 1:
+            return self(x) * (x - xs[0])
+        i = bisect_left(xs, x, 1, len(xs) - 1)
+        return self._cumulative()[i - 1] + self._area(i, x)
+
+    def _weights(self, x_list):
+        xs = self._xs
+        if not xs:
+            raise OverflowError(f'x_list={self.x_list} y_list={self.y_list}')
+        x_list = tuple(map(float, x_list))
+        if len(xs) == 1:
+            return [((0, 1.0),)] * len(x_list)
+        weights = []
+        for x, i in zip(x_list, _search(bisect_left, xs, x_list, 1, -1)):
+            w = (x - xs[i - 1]) / (xs[i] - xs[i - 1])
+            weights.append(((i - 1, 1.0 - w), (i, w)))
+        return weights
 
 
 class piecewise_linear(linear):
@@ -531,16 +1174,46 @@ class piecewise_linear(linear):
         super().__init__(x_list, y_list)
 
     def __call__(self, x):
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
         if not self:
             cls = self.__class__.__name__
             raise ValueError(f"{cls} must contain at least one point")
-        x = float(x)
-        if len(self) == 1 or x <= self.x_list[0]:
-            return self.y_list[0]
-        if self.x_list[-1] <= x:
-            return self.y_list[-1]
+        xs, ys = self._xs, self._ys
+        if len(ys) == 1 or x <= xs[0]:
+            return _const(x, ys[0])
+        if xs[-1] <= x:
+            return _const(x, ys[-1])
         return super().__call__(x)
 
+    def eval_many(self, x_list):
+        if not self:
+            cls = self.__class__.__name__
+            raise ValueError(f"{cls} must contain at least one point")
+        x_list = tuple(map(float, x_list))
+        first, last = self._xs[0], self._xs[-1]
+        y_first, y_last = self._ys[0], self._ys[-1]
+        return [y_first if x <= first else y_last if last <= x else y
+                for x, y in zip(x_list, super().eval_many(x_list))]
+
+    def _primitive(self, x):
+        if not self:
+            cls = self.__class__.__name__
+            raise ValueError(f"{cls} must contain at least one point")
+        xs, ys = self._xs, self._ys
+        if len(ys) == 1 or x <= xs[0]:
+            return ys[0] * (x - xs[0])
+        if xs[-1] <= x:
+            return self._cumulative()[-1] + ys[-1] * (x - xs[-1])
+        return super()._primitive(x)
+
+    def _weights(self, x_list):
+        x_list = tuple(map(float, x_list))
+        xs = self._xs
+        first, last = ((0, 1.0),), ((len(xs) - 1, 1.0),)
+        return [first if x <= xs[0] else last if xs[-1] <= x else w
+                for x, w in zip(x_list, super()._weights(x_list))]
+
 
 class loglinear(linear):
     def __init__(self, x_list=(), y_list=()):
@@ -583,8 +1256,27 @@ class loglinear(linear):
         super(loglinear, self).__init__(x_list, log_y_list)
 
     def __call__(self, x):
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
         log_y = super(loglinear, self).__call__(x)
-        return exp(log_y)
+        return _dual_exp(log_y)
+
+    def eval_many(self, x_list):
+        return [exp(log_y) for log_y in super().eval_many(x_list)]
+
+    def _area(self, i, x):
+        d = x - self._xs[i - 1]
+        s = self._dy[i]
+        y = exp(self._ys[i - 1])
+        return y * expm1(s * d) / s if s else y * d
+
+    def gradient_many(self, x_list):
+        # f = exp(log_y) with log_y linear in log(y_i)
+        x_list = tuple(map(float, x_list))
+        xs, ys = self._xs, self._ys
+        return [{xs[i]: w * y / exp(ys[i]) for i, w in weights}
+                for y, weights in zip(self.eval_many(x_list),
+                                      self._weights(x_list))]
 
 
 class loglinearrate(linear):
@@ -635,10 +1327,33 @@ class loglinearrate(linear):
         super(loglinearrate, self).__init__(x_list, log_y_list)
 
     def __call__(self, x):
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
         if not x:
+            if type(x) is _Dual and self._y_at_zero is not None:
+                # slope of exp(x * log_y) at zero is log_y
+                log_y = float(super(loglinearrate, self).__call__(0.0))
+                return _Dual(self._y_at_zero, log_y * x.d)
             return self._y_at_zero
         log_y = super(loglinearrate, self).__call__(x)
-        return exp(log_y * x)
+        return _dual_exp(log_y * x)
+
+    def eval_many(self, x_list):
+        x_list = tuple(map(float, x_list))
+        return [exp(log_y * x) if x else self._y_at_zero
+                for x, log_y in zip(x_list, super().eval_many(x_list))]
+
+    integral = None
+
+    def gradient_many(self, x_list):
+        # f = exp(log_y * x) with log_y linear in log(y_i) / x_i
+        x_list = tuple(map(float, x_list))
+        xs, ys = self._xs, self._ys
+        zero = {} if self._y_at_zero is None else {0.0: 1.0}
+        return [{xs[i]: w * y * x / (xs[i] * exp(ys[i] * xs[i]))
+                 for i, w in weights} if x else dict(zero)
+                for x, y, weights in zip(x_list, self.eval_many(x_list),
+                                         self._weights(x_list))]
 
 
 class logconstantrate(constant):
@@ -683,10 +1398,33 @@ class logconstantrate(constant):
         super(logconstantrate, self).__init__(x_list, log_y_list)
 
     def __call__(self, x):
+        if not isinstance(x, (int, float)):
+            return self._dispatch(x)
         if not x:
+            if type(x) is _Dual and self._y_at_zero is not None:
+                # slope of exp(-x * log_y) at zero is -log_y
+                log_y = float(super(logconstantrate, self).__call__(0.0))
+                return _Dual(self._y_at_zero, -log_y * x.d)
             return self._y_at_zero
         log_y = super(logconstantrate, self).__call__(x)
-        return exp(-log_y * x)
+        return _dual_exp(-log_y * x)
+
+    def eval_many(self, x_list):
+        x_list = tuple(map(float, x_list))
+        return [exp(-log_y * x) if x else self._y_at_zero
+                for x, log_y in zip(x_list, super().eval_many(x_list))]
+
+    integral = None
+
+    def gradient_many(self, x_list):
+        # f = exp(-log_y * x) with log_y = -log(y_i) / x_i
+        x_list = tuple(map(float, x_list))
+        xs, ys = self._xs, self._ys
+        zero = {} if self._y_at_zero is None else {0.0: 1.0}
+        return [{xs[i]: w * y * x / (xs[i] * exp(-ys[i] * xs[i]))
+                 for i, w in weights} if x else dict(zero)
+                for x, y, weights in zip(x_list, self.eval_many(x_list),
+                                         self._weights(x_list))]
 
 
 # --- extrapolation ---
@@ -702,6 +1440,9 @@ class base_extrapolation:
         domain = self.mid.x_list
         self.min_max_x = min(domain), max(domain)
 
+    def _nodes(self):
+        return self.mid, self.left, self.right
+
     def __call__(self, x):
         min_x, max_x = self.min_max_x
 
@@ -712,17 +1453,46 @@ class base_extrapolation:
                 return self.right(x)
             return self.mid(x)
 
-        # interpolation
-        y = self.mid(_ for _ in x if min_x <= x <= max_x)
+        return self.eval_many(x)
 
-        # left extrapolation
-        if self.left:
-            y = self.left(_ for _ in x if x < min_x) + y
+    def eval_many(self, x_list):
+        """evaluate extrapolation at many points at once
 
-        # right extrapolation
-        if self.right:
-            y = y + self.right(_ for _ in x if max_x < x)
+        :param x_list: (iterable) points to evaluate at
+        :return: list of values
+
+        Points are split into left, mid and right region
+        and each region is evaluated at once.
+
+        >>> from curves.interpolation import extrapolation, linear, constant
+        >>> c = extrapolation([1, 2, 3], [1, 2, 3], mid=constant, right=linear)
+        >>> c.eval_many([4, 0, 1.5, 2])
+        [4.0, 1.0, 1.0, 2.0]
+
+        """
+        x_list = tuple(x_list)
+        order = None
+        if any(b < a for a, b in zip(x_list, x_list[1:])):
+            order = sorted(range(len(x_list)), key=x_list.__getitem__)
+            x_list = tuple(x_list[k] for k in order)
 
+        min_x, max_x = self.min_max_x
+        i = bisect_left(x_list, min_x) if self.left else 0
+        j = bisect_right(x_list, max_x) if self.right else len(x_list)
+
+        y = _eval_many(self.mid, x_list[i:j])
+        # left extrapolation
+        if i:
+            y = _eval_many(self.left, x_list[:i]) + y
+        # right extrapolation
+        if j < len(x_list):
+            y = y + _eval_many(self.right, x_list[j:])
+
+        if order is None:
+            return y
+        sorted_y, y = y, [None] * len(y)
+        for k, v in zip(order, sorted_y):
+            y[k] = v
         return y
 
     def __copy__(self):
@@ -780,5 +1550,5 @@ class waterfall_extrapolation(base_extrapolation):
 
 def waterfall(*mid, left=None, right=None):
     if 1 < len(mid):
-        left = waterfall(*mid, left=left)
+        left = waterfall(*mid[1:], left=left)
     return base_extrapolation(mid[0], left=left, right=right)
@@ -10,10 +10,43 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
+from heapq import heappop, heappush
+from math import copysign
+from sys import float_info
+
+
 TOL = 1e-8
 MAX_ITER = 1_000
+MAX_SUBDIVISIONS = 50
 EPS = 1e-7
 
+# Gauss-Kronrod nodes of 15 point Kronrod rule on [-1, 1] (x and -x)
+# where every second node, i.e. 1, 3, 5 and 7, is a 7 point Gauss node
+K15_NODES = (0.991455371120812639206854697526329,
+             0.949107912342758524526189684047851,
+             0.864864423359769072789712788640926,
+             0.741531185599394439863864773280788,
+             0.586087235467691130294144845693013,
+             0.405845151377397166906606412076961,
+             0.207784955007898467600689403773245,
+             0.000000000000000000000000000000000)
+K15_WEIGHTS = (0.022935322010529224963732008058970,
+               0.063092092629978553290700663189204,
+               0.104790010322250183839876322541518,
+               0.140653259715525918745189590510238,
+               0.169004726639267902826583426598550,
+               0.190350578064785409913256402421014,
+               0.204432940075298892414161999234649,
+               0.209482141084727828012999174891714)
+G7_WEIGHTS = (0.0,
+              0.129484966168869693270611432679082,
+              0.0,
+              0.279705391489276667901467771423780,
+              0.0,
+              0.381830050505118944950369775488975,
+              0.0,
+              0.417959183673469387755102040816327)
+
 
 def finite_difference(f, x, h=EPS):
     """
@@ -67,30 +100,64 @@ def quadrature(f, a, b):
 
     :return: float: The numerical integral of f from a to b.
     """
-    nodes = {0.0: 0.20948214108472782,
-             -0.20778495500789848: 0.20443294007529889,
-             0.20778495500789848: 0.20443294007529889,
-             -0.4058451513773972: 0.19035057806478542,
-             0.4058451513773972: 0.19035057806478542,
-             -0.5860872354676911: 0.1690047266392679,
-             0.5860872354676911: 0.1690047266392679,
-             -0.7415311855993945: 0.14065325971552592,
-             0.7415311855993945: 0.14065325971552592,
-             -0.8648644233597691: 0.10479001032225019,
-             0.8648644233597691: 0.10479001032225019,
-             -0.9491079123427585: 0.06309209262997856,
-             0.9491079123427585: 0.06309209262997856,
-             -0.9914553711208126: 0.022935322010529224,
-             0.9914553711208126: 0.022935322010529224}
+    return _kronrod(f, a, b)[0]
+
+
+integrate = quadrature
+
+
+def _kronrod(f, a, b):
+    # 15 point Kronrod and 7 point Gauss rule on [a, b]
     m = 0.5 * (b + a)
     h = 0.5 * (b - a)
-    return sum(w * f(m + h * n) for n, w in nodes.items()) * h
+    k = g = 0.0
+    for n, kw, gw in zip(K15_NODES, K15_WEIGHTS, G7_WEIGHTS):
+        y = f(m + h * n) + f(m - h * n) if n else f(m)
+        k += kw * y
+        g += gw * y
+    return k * h, abs(k - g) * abs(h)
 
 
-integrate = quadrature
+def gauss_kronrod(f, a, b, tol=TOL, max_subdivisions=MAX_SUBDIVISIONS):
+    """
+    Numerically integrate the function f from a to b
+    using adaptive Gauss-Kronrod quadrature.
+
+    :param f: (function) The function to integrate.
+    :param a: (float) The start point of the interval.
+    :param b: (float) The end point of the interval.
+    :param tol: (float) Tolerance of the absolute error estimate.
+    :param max_subdivisions: (int) Maximum number of interval bisections.
 
+    :return: tuple(float, float): The numerical integral of f from a to b
+        and its absolute error estimate.
 
-def newton_raphson(f, a, tol=TOL, max_iter=MAX_ITER):
+    The 15 point Kronrod rule (G7/K15) is applied and its difference
+    to the embedded 7 point Gauss rule is taken as error estimate.
+    As long as the total error estimate exceeds **tol**
+    the subinterval with the largest error estimate is bisected.
+
+    >>> from curves.numerics import gauss_kronrod
+    >>> gauss_kronrod(lambda x: abs(x - 0.3), 0, 1)
+    (0.28999999..., ...e-09)
+
+    """
+    value, error = _kronrod(f, a, b)
+    heap = [(-error, a, b, value)]
+    for _ in range(max_subdivisions):
+        if error <= tol:
+            break
+        _, a, b, v = heappop(heap)
+        m = 0.5 * (a + b)
+        left, right = _kronrod(f, a, m), _kronrod(f, m, b)
+        heappush(heap, (-left[1], a, m, left[0]))
+        heappush(heap, (-right[1], m, b, right[0]))
+        value = sum(v for *_, v in heap)
+        error = -sum(e for e, *_ in heap)
+    return value, error
+
+
+def newton_raphson(f, a, tol=TOL, max_iter=MAX_ITER, df=None, info=None):
     """
     Newton-Raphson method to find the root of a function.
 
@@ -98,12 +165,18 @@ def newton_raphson(f, a, tol=TOL, max_iter=MAX_ITER):
     :param a: (float) Initial guess
     :param tol: (float) Tolerance for convergence
     :param max_iter: (int) Maximum number of iterations
+    :param df: (callable) derivative of f (optional),
+        by default f is evaluated at dual numbers
+        and by finite differences if f does not propagate them
+    :param info: (dict) to store the number of **iterations** (optional)
 
     :return: float : The root of the function
     """
     for i in range(max_iter):
-        fa = f(a)
-        dfa = finite_difference(f, a)
+        if df is None:
+            fa, dfa = _value_and_derivative(f, a)
+        else:
+            fa, dfa = f(a), df(a)
         if dfa == 0:
             raise ZeroDivisionError("Derivative is zero at {a=}")
 
@@ -111,6 +184,7 @@ def newton_raphson(f, a, tol=TOL, max_iter=MAX_ITER):
 
         # Check for convergence
         if abs(b - a) < tol:
+            _iterations(info, i)
             return b
 
         a = b
@@ -118,7 +192,7 @@ def newton_raphson(f, a, tol=TOL, max_iter=MAX_ITER):
     raise RuntimeError("Exceeded maximum iterations")
 
 
-def bisection_method(f, a, b, tol=TOL, max_iter=MAX_ITER):
+def bisection_method(f, a, b, tol=TOL, max_iter=MAX_ITER, info=None):
     """
     Bisection method to find the root of a function.
 
@@ -127,32 +201,36 @@ def bisection_method(f, a, b, tol=TOL, max_iter=MAX_ITER):
     :param b: (float) Right endpoint of the initial interval
     :param tol: (float) Tolerance for convergence
     :param max_iter: (int) Maximum number of iterations
+    :param info: (dict) to store the number of **iterations** (optional)
 
     :return: float : The root of the function
     """
-    if f(a) * f(b) >= 0:
+    fa = f(a)
+    if fa * f(b) >= 0:
         msg = f"The function must have opposite signs at {a=} and {b=}"
         raise ValueError(msg)
 
-    for _ in range(max_iter):
+    for i in range(max_iter):
         # Calculate midpoint
         c = (a + b) / 2
+        fc = f(c)
 
         # Check if midpoint is a root
         # or if the interval is smaller than tolerance
-        if abs(f(c)) < tol or abs(b - a) / 2 < tol:
+        if abs(fc) < tol or abs(b - a) / 2 < tol:
+            _iterations(info, i)
             return c
 
         # Decide the side to repeat the steps on
-        if f(c) * f(a) < 0:
+        if fc * fa < 0:
             b = c
         else:
-            a = c
+            a, fa = c, fc
 
     raise RuntimeError("Exceeded maximum iterations")
 
 
-def secant_method(f, a, b, tol=TOL, max_iter=MAX_ITER):
+def secant_method(f, a, b, tol=TOL, max_iter=MAX_ITER, info=None):
     """
     Secant method to find the root of a function.
 
@@ -161,14 +239,14 @@ def secant_method(f, a, b, tol=TOL, max_iter=MAX_ITER):
     :param b: (float) Second initial guess
     :param tol: (float) Tolerance for convergence
     :param max_iter: (int) Maximum number of iterations
+    :param info: (dict) to store the number of **iterations** (optional)
 
     :return: float : The root of the function
     """
+    # Calculate the value of the function at the initial guesses
+    fa = f(a)
+    fb = f(b)
     for i in range(max_iter):
-        # Calculate the value of the function at the initial guesses
-        fa = f(a)
-        fb = f(b)
-
         if abs(fb - fa) < tol:
             msg = f"Denominator is too small at {a=} and {b=}"
             raise ZeroDivisionError(msg)
@@ -178,38 +256,431 @@ def secant_method(f, a, b, tol=TOL, max_iter=MAX_ITER):
 
         # Check for convergence
         if abs(c - b) < tol:
+            _iterations(info, i)
+            return c
+
+        # Update guesses
+        a, fa = b, fb
+        b, fb = c, f(c)
+
+    raise RuntimeError("Exceeded maximum iterations")
+
+
+def brent_method(f, a, b, tol=TOL, max_iter=MAX_ITER, info=None):
+    """
+    Brent's method to find the root of a function.
+
+    :param f: (callable) function
+    :param a: (float) Left endpoint of the initial interval
+    :param b: (float) Right endpoint of the initial interval
+    :param tol: (float) Tolerance for convergence
+    :param max_iter: (int) Maximum number of iterations
+    :param info: (dict) to store the number of **iterations** (optional)
+
+    :return: float : The root of the function
+
+    Combines inverse quadratic interpolation and secant steps
+    with bisection as safeguard.
+    So it converges like the secant method for smooth functions
+    but never leaves the bracketing interval
+    and never fails on flat regions.
+    Any iteration invokes **f** only once.
+
+    >>> from curves.numerics import brent_method
+    >>> brent_method(lambda x: x * x - 2, 0, 2)
+    1.414213562...
+
+    """
+    fa, fb = f(a), f(b)
+    if 0 < fa * fb:
+        msg = f"The function must have opposite signs at {a=} and {b=}"
+        raise ValueError(msg)
+
+    steps, fx = _brent(a, fa, b, fb, tol), None
+    for i in range(max_iter):
+        try:
+            x = steps.send(fx)
+        except StopIteration as stop:
+            _iterations(info, i)
+            return stop.value
+        fx = f(x)
+
+    raise RuntimeError("Exceeded maximum iterations")
+
+
+def _brent(a, fa, b, fb, tol):
+    # generator of iterates of Brent's method
+    # which receives function values at iterates by send
+    c, fc = b, fb
+    d = e = b - a
+    while True:
+        if 0 < fb * fc:
+            # keep root bracketed by b and c
+            c, fc = a, fa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, fa = b, fb
+            b, fb = c, fc
+            c, fc = a, fa
+
+        # Check for convergence
+        tol1 = 2 * float_info.epsilon * abs(b) + 0.5 * tol
+        m = 0.5 * (c - b)
+        if abs(m) <= tol1 or not fb:
+            return b
+
+        if tol1 <= abs(e) and abs(fb) < abs(fa):
+            # inverse quadratic interpolation or secant step
+            s = fb / fa
+            if a == c:
+                p, q = 2 * m * s, 1 - s
+            else:
+                q, r = fa / fc, fb / fc
+                p = s * (2 * m * q * (q - r) - (b - a) * (r - 1))
+                q = (q - 1) * (r - 1) * (s - 1)
+            if 0 < p:
+                q = -q
+            p = abs(p)
+            if 2 * p < min(3 * m * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = m
+        else:
+            # bisection step
+            d = e = m
+
+        a, fa = b, fb
+        b += d if tol1 < abs(d) else copysign(tol1, m)
+        fb = yield b
+
+
+def secant_method_many(f, a, b, tol=TOL, max_iter=MAX_ITER):
+    """
+    Secant method to find the roots of many independent functions at once.
+
+    :param f: (callable) vectorized function
+        taking and returning a list of floats
+    :param a: (list) First initial guesses
+    :param b: (list) Second initial guesses
+    :param tol: (float) Tolerance for convergence
+    :param max_iter: (int) Maximum number of iterations
+
+    :return: list : The roots of the functions
+
+    All problems are iterated in lockstep
+    and converged ones are kept fixed.
+    So **f** is invoked only once per iteration.
+
+    >>> from curves.numerics import secant_method_many
+    >>> secant_method_many(lambda x: [x[0] ** 2 - 2, x[1] - 3], [1, 1], [2, 2])
+    [1.414213562..., 3.0]
+
+    """
+    a, b = list(a), list(b)
+    fa, fb = f(a), f(b)
+    active = set(range(len(b)))
+    for i in range(max_iter):
+        c = list(b)
+        for j in active:
+            if abs(fb[j] - fa[j]) < tol:
+                msg = f"Denominator is too small at a={a[j]} and b={b[j]}"
+                raise ZeroDivisionError(msg)
+
+            # Compute the next approximation
+            c[j] = b[j] - fb[j] * (b[j] - a[j]) / (fb[j] - fa[j])
+
+        # Check for convergence
+        active = set(j for j in active if not abs(c[j] - b[j]) < tol)
+        if not active:
             return c
 
         # Update guesses
-        a, b = b, c
+        a, fa = b, fb
+        b, fb = c, f(c)
 
     raise RuntimeError("Exceeded maximum iterations")
 
 
-def solve(f, method='secant_method', *args, **kwargs):
+def bisection_method_many(f, a, b, tol=TOL, max_iter=MAX_ITER):
+    """
+    Bisection method to find the roots of many independent functions at once.
+
+    :param f: (callable) vectorized function
+        taking and returning a list of floats
+    :param a: (list) Left endpoints of the initial intervals
+    :param b: (list) Right endpoints of the initial intervals
+    :param tol: (float) Tolerance for convergence
+    :param max_iter: (int) Maximum number of iterations
+
+    :return: list : The roots of the functions
+
+    Same as |secant_method_many()| but by bisection.
+
+    >>> from curves.numerics import bisection_method_many
+    >>> bisection_method_many(lambda x: [x[0] ** 2 - 2, x[1] - 3], [1, 1], [2, 5])
+    [1.41421356..., 3.0]
+
+    """  # noqa E501
+    a, b = list(a), list(b)
+    fa, fb = f(a), f(b)
+    for j, (u, v) in enumerate(zip(fa, fb)):
+        if u * v >= 0:
+            msg = f"The function must have opposite signs " \
+                  f"at a={a[j]} and b={b[j]}"
+            raise ValueError(msg)
+
+    c = list(b)
+    active = set(range(len(b)))
+    for i in range(max_iter):
+        # Calculate midpoints
+        for j in active:
+            c[j] = (a[j] + b[j]) / 2
+        fc = f(c)
+
+        # Check if midpoint is a root
+        # or if the interval is smaller than tolerance
+        active = set(j for j in active if not abs(fc[j]) < tol
+                     and not abs(b[j] - a[j]) / 2 < tol)
+        if not active:
+            return c
+
+        # Decide the side to repeat the steps on
+        for j in active:
+            if fc[j] * fa[j] < 0:
+                b[j] = c[j]
+            else:
+                a[j], fa[j] = c[j], fc[j]
+
+    raise RuntimeError("Exceeded maximum iterations")
+
+
+def newton_raphson_many(f, a, tol=TOL, max_iter=MAX_ITER, df=None):
+    """
+    Newton-Raphson method to find the roots of many independent functions
+    at once.
+
+    :param f: (callable) vectorized function
+        taking and returning a list of floats
+    :param a: (list) Initial guesses
+    :param tol: (float) Tolerance for convergence
+    :param max_iter: (int) Maximum number of iterations
+    :param df: (callable) vectorized derivative of f (optional),
+        by default **f** is evaluated at |Dual| numbers
+        or, if these are not propagated, by finite differences
+
+    :return: list : The roots of the functions
+
+    Same as |secant_method_many()| but by Newton-Raphson steps.
+
+    >>> from curves import X
+    >>> from curves.numerics import newton_raphson_many
+    >>> f = X * X - 2
+    >>> newton_raphson_many(f.eval_many, [1, 3])
+    [1.414213562..., 1.414213562...]
+
+    """
+    a = list(a)
+    active = set(range(len(a)))
+    for i in range(max_iter):
+        if df is None:
+            fa, dfa = _values_and_derivatives(f, a)
+        else:
+            fa, dfa = f(a), df(a)
+        b = list(a)
+        for j in active:
+            if dfa[j] == 0:
+                raise ZeroDivisionError(f"Derivative is zero at a={a[j]}")
+            b[j] = a[j] - fa[j] / dfa[j]
+
+        # Check for convergence
+        active = set(j for j in active if not abs(b[j] - a[j]) < tol)
+        if not active:
+            return b
+
+        a = b
+
+    raise RuntimeError("Exceeded maximum iterations")
+
+
+def _value_and_derivative(f, x):
+    # evaluate f at a dual number or by finite differences
+    from .dual import Dual
+
+    y = f(Dual(x, 1.0))
+    if isinstance(y, Dual):
+        return float(y), y.d
+    return y, finite_difference(f, x)
+
+
+def _values_and_derivatives(f, x_list):
+    # evaluate vectorized f at dual numbers or by finite differences
+    from .dual import Dual
+
+    y_list = f([Dual(x, 1.0) for x in x_list])
+    if all(isinstance(y, Dual) for y in y_list):
+        return [float(y) for y in y_list], [y.d for y in y_list]
+    up = f([x + EPS for x in x_list])
+    down = f([x - EPS for x in x_list])
+    return y_list, [(u - d) / (2 * EPS) for u, d in zip(up, down)]
+
+
+def brent_method_many(f, a, b, tol=TOL, max_iter=MAX_ITER):
+    """
+    Brent's method to find the roots of many independent functions at once.
+
+    :param f: (callable) vectorized function
+        taking and returning a list of floats
+    :param a: (list) Left endpoints of the initial intervals
+    :param b: (list) Right endpoints of the initial intervals
+    :param tol: (float) Tolerance for convergence
+    :param max_iter: (int) Maximum number of iterations
+
+    :return: list : The roots of the functions
+
+    Same as |secant_method_many()| but by |brent_method()|.
+
+    >>> from curves.numerics import brent_method_many
+    >>> brent_method_many(lambda x: [x[0] ** 2 - 2, x[1] - 3], [1, 1], [2, 4])
+    [1.414213562..., 3.0]
+
+    """
+    a, b = list(a), list(b)
+    fa, fb = f(a), f(b)
+    for j, (u, v) in enumerate(zip(fa, fb)):
+        if 0 < u * v:
+            msg = f"The function must have opposite signs " \
+                  f"at a={a[j]} and b={b[j]}"
+            raise ValueError(msg)
+
+    steps = [_brent(*_, tol) for _ in zip(a, fa, b, fb)]
+    x, fx = list(b), [None] * len(b)
+    active = set(range(len(b)))
+    for i in range(max_iter):
+        for j in tuple(active):
+            try:
+                x[j] = steps[j].send(fx[j])
+            except StopIteration as stop:
+                x[j] = stop.value
+                active.remove(j)
+        if not active:
+            return x
+        fx = f(x)
+
+    raise RuntimeError("Exceeded maximum iterations")
+
+
+def _iterations(info, i):
+    if info is not None:
+        info['iterations'] = i + 1
+
+
+def solve(f, method='secant_method', *args, full_output=False, **kwargs):
     """solver providing function
 
     :param f: (callable) function
-    :param method: (str or callable) solver method
+    :param method: (str or callable) solver method, i.e.
+        'secant_method' (default), 'brent_method',
+        'bisection_method' or 'newton_raphson'
     :param args: **method** arguments
+    :param full_output: (bool) if **True** also return a dict with
+        the number of function **evaluations** and
+        solver **iterations** (optional)
     :param kwargs: **method** keyword arguments
-    :return:
+    :return: root (and dict if **full_output**)
+
+    >>> from curves.numerics import solve
+    >>> solve(lambda x: x * x - 2, 'brent', a=0, b=2, full_output=True)
+    (1.414213562..., {'evaluations': 9, 'iterations': 8})
+
+    """
+    info = None
+    if full_output:
+        info = {'evaluations': 0, 'iterations': None}
+        func = f
+
+        def f(x):
+            info['evaluations'] += 1
+            return func(x)
+
+    if callable(method):
+        root = method(f, *args, **kwargs)
+        return (root, info) if full_output else root
+
+    method = str(method) if method else 'secant_method'
+    solver = _solver(method)
+    args, kwargs = _solver_kwargs(method, args, kwargs, solver)
+    if not full_output:
+        return solver(f, *args, **kwargs)
+    return solver(f, *args, info=info, **kwargs), info
+
+
+def solve_many(f, method='secant_method', *args, size=None, **kwargs):
+    """solver providing function for many independent problems at once
+
+    :param f: (callable) vectorized function
+        taking and returning a list of floats
+    :param method: (str or callable) solver method, i.e.
+        'secant_method' (default), 'brent_method',
+        'bisection_method' or 'newton_raphson'
+    :param args: **method** arguments
+    :param size: (int) number of problems (optional),
+        required only if no initial values are given as list
+    :param kwargs: **method** keyword arguments
+    :return: list of roots
+
+    Same as |solve()| but by the batched solvers
+    |secant_method_many()|, |brent_method_many()|,
+    |bisection_method_many()| or |newton_raphson_many()|.
+    Initial values given as a single float are used for all problems.
+
+    >>> from curves import X
+    >>> from curves.numerics import solve_many
+    >>> f = X * X - 2
+    >>> solve_many(f.eval_many, 'brent', a=[0, 1], b=2)
+    [1.414213562..., 1.414213562...]
 
     """
     if callable(method):
         return method(f, *args, **kwargs)
 
-    # default method
     method = str(method) if method else 'secant_method'
+    solver = _solver(method, many=True)
+    args, kwargs = _solver_kwargs(method, args, kwargs, solver)
+
+    # broadcast initial values
+    initial = {k: v for k, v in kwargs.items() if k in ('a', 'b')}
+    sizes = [len(v) for v in initial.values() if isinstance(v, (list, tuple))]
+    size = sizes[0] if sizes else size
+    if size is None:
+        raise ValueError("initial values must be given as list")
+    for k, v in initial.items():
+        if not isinstance(v, (list, tuple)):
+            kwargs[k] = [v] * size
+    return solver(f, *args, **kwargs)
+
+
+def _solver(method, many=False):
+    if 'newton' in method:
+        return newton_raphson_many if many else newton_raphson
+    if 'secant' in method:
+        return secant_method_many if many else secant_method
+    if 'brent' in method:
+        return brent_method_many if many else brent_method
+    if 'bisec' in method:
+        return bisection_method_many if many else bisection_method
+    raise ValueError(f"unknown method {method}")
+
 
-    # gather arguments
-    guess = kwargs.get('guess', None)
+def _solver_kwargs(method, args, kwargs, solver):
+    # gather arguments with initial values given as keywords
+    kwargs = dict(kwargs)
+    guess = kwargs.pop('guess', None)
     a, b = kwargs.pop('bounds', (guess, None))
     a = kwargs.pop('a', a)
     b = kwargs.pop('b', b)
-    if a:
+    if a is not None:
         kwargs['a'] = a
-    if b:
+    if b is not None:
         kwargs['b'] = b
 
     tol = kwargs.pop('tol', None)
@@ -218,26 +689,52 @@ def solve(f, method='secant_method', *args, **kwargs):
     if tol:
         kwargs['tol'] = tol
 
+    # default initial values
     if 'newton' in method:
-        if len(args) < 1:
-            kwargs['a'] = kwargs.get('a', 0.01)
-        return newton_raphson(f, *args, **kwargs)
+        defaults = 0.01,
+    elif 'secant' in method:
+        defaults = 0.01, 0.1
+    else:
+        defaults = -0.1, 0.2
+    kwargs.update(zip('ab', args[:len(defaults)]))
+    for k, v in zip('ab', defaults):
+        kwargs[k] = kwargs.get(k, v)
 
-    if 'secant' in method:
-        if len(args) < 1:
-            kwargs['a'] = kwargs.get('a', 0.01)
-        if len(args) < 2:
-            kwargs['b'] = kwargs.get('b', 0.1)
-        return secant_method(f, *args, **kwargs)
+    # further positional arguments as keywords, too
+    args = args[len(defaults):]
+    code = solver.__code__
+    names = code.co_varnames[1 + len(defaults):code.co_argcount]
+    kwargs.update(zip(names, args))
+    return args[len(names):], kwargs
 
-    if 'bisec' in method:
-        if len(args) < 1:
-            kwargs['a'] = kwargs.get('a', -0.1)
-        if len(args) < 2:
-            kwargs['b'] = kwargs.get('b', 0.2)
-        return bisection_method(f, *args, **kwargs)
 
-    raise ValueError(f"unknown method {method}")
+def inverse(matrix):
+    """inverse of a square matrix by Gauss-Jordan elimination
+
+    :param matrix: (list(list(float))) square matrix given by rows
+    :return: (list(list(float))) inverse matrix given by rows
+
+    >>> from curves.numerics import inverse
+    >>> inverse([[2.0, 0.0], [1.0, 4.0]])
+    [[0.5, 0.0], [-0.125, 0.25]]
+
+    """
+    n = len(matrix)
+    rows = [list(map(float, row)) + [float(i == j) for j in range(n)]
+            for i, row in enumerate(matrix)]
+    for i in range(n):
+        # partial pivoting
+        p = max(range(i, n), key=lambda k: abs(rows[k][i]))
+        if not rows[p][i]:
+            raise ZeroDivisionError("matrix is singular")
+        rows[i], rows[p] = rows[p], rows[i]
+        pivot = rows[i]
+        pivot[:] = [v / pivot[i] for v in pivot]
+        for k in range(n):
+            if k != i and rows[k][i]:
+                row, c = rows[k], rows[k][i]
+                row[:] = [v - c * w for v, w in zip(row, pivot)]
+    return [row[n:] for row in rows]
 
 
 # Example usage integration
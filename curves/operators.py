@@ -10,36 +10,296 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
-from .numerics import finite_difference, quadrature, EPS
+from bisect import bisect_left
+from collections import deque
+from functools import partial
+import math
+
+from . import functions as _f
+from .curves import Curve as _Curve, init as _init, _Stamp
+from .dual import Dual, _DERIVATIVES
+from .numerics import quadrature, gauss_kronrod, finite_difference, \
+    EPS, MAX_SUBDIVISIONS
 
 
 class Integral:
 
-    def __init__(self, curve, a=0):
+    def __init__(self, curve, a=0, tol=None,
+                 max_subdivisions=MAX_SUBDIVISIONS, cache=0):
         r"""integral of function
 
         :param curve: (callable) function $f$ to integrate
         :param a: (float) lower bound $a$ of integral
+        :param tol: (float) tolerance of absolute error estimate (optional)
+            if given, adaptive Gauss-Kronrod quadrature is used
+        :param max_subdivisions: (int) maximum number of interval bisections
+            of adaptive quadrature (optional)
+        :param cache: (int) maximum number of cached integrals (optional)
+            if given, $F_a(x)$ is integrated from the nearest cached point
 
         calculates the integral
 
         $$F_a(x) = \int_a^x f(s) ds$$
 
+        If **curve** provides a closed form **integral** method,
+        like most interpolations do, it is used
+        instead of numerical quadrature.
+
+        >>> from curves import Integral, X
+        >>> from curves.functions import ramp
+        >>> Integral(ramp @ (X - 0.3))(1)
+        0.2443...
+        >>> Integral(ramp @ (X - 0.3), tol=1e-10)(1)
+        0.2449999...
+
+        With **cache** the integral is built up panel by panel
+        from previously requested points,
+        i.e. only the part between the nearest cached point and $x$
+        is integrated.
+        Least recently added points are evicted first
+        and any modification of the integrated curve clears the cache.
+
+        >>> F = Integral(X * X, cache=100)
+        >>> F(0.5), F(1)
+        (0.0416..., 0.3333...)
+
+        To integrate on a whole grid in a single sweep use |Integral.on_grid()|
+
+        >>> Integral(X * X).on_grid([1, 0.5, 0.75])
+        [0.3333..., 0.0416..., 0.1406...]
+
         """
         self.curve = curve
         self.a = a
+        self.tol = tol
+        self.max_subdivisions = max_subdivisions
+        self.cache = cache
+        self._xs, self._ys, self._added = [], [], deque()
+        self._stamp = None
 
     def __call__(self, x):
-        return quadrature(self.curve, self.a, x)
+        if not self.cache:
+            return self._integrate(self.a, x)
+        if self._stamp is None or not self._stamp.valid(self.curve):
+            self.clear()
+        xs, ys = self._xs, self._ys
+        i = bisect_left(xs, x)
+        if i < len(xs) and xs[i] == x:
+            return ys[i]
+        start, y = self.a, 0.0
+        for j in (i - 1, i):
+            if 0 <= j < len(xs) and abs(x - xs[j]) < abs(x - start):
+                start, y = xs[j], ys[j]
+        y += self._integrate(start, x)
+        xs.insert(i, x)
+        ys.insert(i, y)
+        self._added.append(x)
+        if self.cache < len(xs):
+            i = bisect_left(xs, self._added.popleft())
+            xs.pop(i)
+            ys.pop(i)
+        return y
+
+    def _integrate(self, a, b):
+        integral = getattr(self.curve, 'integral', None)
+        if integral is not None:
+            return integral(a, b)
+        if self.tol is None:
+            return quadrature(self.curve, a, b)
+        return gauss_kronrod(self.curve, a, b,
+                             self.tol, self.max_subdivisions)[0]
+
+    def on_grid(self, x_list):
+        r"""integrals on a grid in a single cumulative sweep
+
+        :param x_list: (list(float)) grid points $x_1, \dots, x_n$
+        :return: (list(float)) integrals $F_a(x_1), \dots, F_a(x_n)$
+
+        Points are visited in order starting from the lower bound $a$,
+        so each panel between consecutive points is integrated only once.
+        """
+        x_list = tuple(x_list)
+        y_list = [0.0] * len(x_list)
+        order = sorted(range(len(x_list)), key=x_list.__getitem__)
+        upper = [i for i in order if self.a <= x_list[i]]
+        lower = [i for i in reversed(order) if x_list[i] < self.a]
+        for indices in (upper, lower):
+            x, y = self.a, 0.0
+            for i in indices:
+                y += self._integrate(x, x_list[i])
+                y_list[i] = y
+                x = x_list[i]
+        return y_list
+
+    def clear(self):
+        """clears cached integrals"""
+        self._xs.clear()
+        self._ys.clear()
+        self._added.clear()
+        self._stamp = _Stamp(self.curve)
+
+    def _nodes(self):
+        return self.curve,
 
     def __getitem__(self, item):
-        return self.__class__(self.curve, item)
+        return self.__class__(self.curve, item, self.tol,
+                              self.max_subdivisions, self.cache)
 
     def __repr__(self):
         _ = f", {self.a}" if self.a else ''
         return f"{self.__class__.__name__}({self.curve}{_})"
 
 
+def _sign(x): return 1 if 0 < x else -1 if x < 0 else 0
+
+
+_X = _Curve()
+_DERIVATIVES.update({
+    _f.ramp.curve: _f.step,
+    _f.step.curve: 0.0,
+    math.acos: -1 / _f.sqrt @ (1 - _X ** 2),
+    math.asin: 1 / _f.sqrt @ (1 - _X ** 2),
+    math.asinh: 1 / _f.sqrt @ (_X ** 2 + 1),
+    math.atan: 1 / (1 + _X ** 2),
+    math.atanh: 1 / (1 - _X ** 2),
+    math.ceil: 0.0,
+    math.cos: -_f.sin,
+    math.cosh: _f.sinh,
+    math.degrees: math.degrees(1.0),
+    math.erf: 2 / math.sqrt(math.pi) * _f.exp @ -_X ** 2,
+    math.erfc: -2 / math.sqrt(math.pi) * _f.exp @ -_X ** 2,
+    math.exp: _f.exp,
+    math.expm1: _f.exp,
+    math.fabs: _Curve(_sign),
+    math.floor: 0.0,
+    math.log: 1 / _X,
+    math.log10: 1 / (math.log(10) * _X),
+    math.log1p: 1 / (1 + _X),
+    math.log2: 1 / (math.log(2) * _X),
+    math.radians: math.radians(1.0),
+    math.sin: _f.cos,
+    math.sinh: _f.cosh,
+    math.sqrt: 0.5 / _f.sqrt,
+    math.tan: 1 + _f.tan ** 2,
+    math.tanh: 1 - _f.tanh ** 2,
+    math.trunc: 0.0,
+})
+
+
+def _curve(a):
+    return _init(a) if callable(a) else a
+
+
+def _add(a, b):
+    if not callable(b) and not b:
+        return a
+    if not callable(a) and not a:
+        return b
+    return _curve(a) + _curve(b)
+
+
+def _neg(a):
+    return -_curve(a)
+
+
+def _sub(a, b):
+    return _add(a, _neg(b))
+
+
+def _mul(a, b):
+    for c, d in ((a, b), (b, a)):
+        if not callable(c) and not c:
+            return 0.0
+        if not callable(c) and c == 1:
+            return d
+    return _curve(a) * _curve(b)
+
+
+def _div(a, b):
+    if not callable(a) and not a:
+        return 0.0
+    return _curve(a) / _curve(b)
+
+
+def _pow(a, n):
+    if n == 0:
+        return 1.0
+    if n == 1 or not callable(a):
+        return a ** n
+    return _curve(a) ** n
+
+
+def _compose(f, g):
+    if not callable(f) or g is _X:
+        return f
+    if not callable(g):
+        return f(g)
+    return _curve(f) @ _curve(g)
+
+
+def _rule(op, other, y, dy, h):
+    # curve value and derivative after operation op with other
+    if op == 'abs':
+        return abs(_curve(y)), _mul(_compose(_sign, y), dy)
+    if op == 'neg':
+        return _neg(y), _neg(dy)
+    if op == '**':
+        n = float(other) if isinstance(other, int) else other
+        return _pow(y, other), _mul(_mul(n, _pow(y, other - 1)), dy)
+    if op == '@':
+        dy = _mul(_compose(_derivative(other, h), y), dy)
+        return _compose(other, y), dy
+    g, dg = other, _derivative(other, h)
+    if op == '+':
+        return _add(y, g), _add(dy, dg)
+    if op == '-':
+        return _sub(y, g), _sub(dy, dg)
+    if op == '*':
+        return _mul(y, g), _add(_mul(dy, g), _mul(y, dg))
+    if op == '/':
+        return _div(y, g), _div(_sub(dy, _mul(_div(y, g), dg)), g)
+    raise ValueError(f"operation {op} not fount.")
+
+
+def _derive(curve, h=EPS):
+    """derivative of **curve** or **None** if **curve** is opaque"""
+    if not callable(curve):
+        return 0.0
+    if getattr(curve, '__hash__', None) and curve in _DERIVATIVES:
+        return _DERIVATIVES[curve]
+    if not isinstance(curve, _Curve) or \
+            type(curve).__call__ is not _Curve.__call__:
+        return None
+
+    x, dx = _X, 1.0
+    if curve._op == '@':
+        x, dx = curve._other, _derivative(curve._other, h)
+
+    if curve.curve is None or isinstance(curve.curve, str):
+        y, dy = x, dx
+    elif callable(curve.curve):
+        y = _compose(curve.curve, x)
+        dy = _mul(_compose(_derivative(curve.curve, h), x), dx)
+    else:
+        y, dy = curve.curve, 0.0
+
+    if curve._op and not curve._op == '@':
+        y, dy = _rule(curve._op, curve._other, y, dy, h)
+
+    for op, other in curve._inplace_ops:
+        if op in '+-*/':
+            # in-place operations see the inner argument
+            other = _compose(other, x)
+        y, dy = _rule(op, other, y, dy, h)
+    return dy
+
+
+def _derivative(curve, h=EPS):
+    """derivative of **curve** (finite differences if **curve** is opaque)"""
+    d = _derive(curve, h)
+    return Derivative(curve, h) if d is None else d
+
+
 class Derivative:
 
     def __init__(self, curve, h=EPS):
@@ -48,17 +308,56 @@ class Derivative:
         :param curve: (callable) function $f$ to differentiate
         :param h: (float) step size $\eta$ for finte differences (optional)
 
-        calculates the (first) derivative via finite differences
+        calculates the (first) derivative exactly
+        by chain, product and quotient rule
+        if **curve** is a |Curve| of elementary functions
+        (as in |curves.functions|).
+
+        >>> from curves import X, Derivative
+        >>> from curves.functions import exp, sin
+        >>> Derivative(X * sin)(0.0)
+        0.0
+        >>> Derivative(exp @ (2 * X))(0.5)
+        5.43656365691809
+
+        Any other callable, e.g. an interpolation, is evaluated
+        at a |Dual| number (forward mode automatic differentiation).
+
+        >>> from curves.interpolation import linear
+        >>> Derivative(linear([0, 1], [0, 2]))(0.5)
+        2.0
+
+        Only if it does not propagate |Dual| numbers
+        it is differentiated via finite differences
 
         $$\frac{\partial f}{\partial x}
-        =f'(x)\approx\frac{f(x+\eta)-f(x)}{\eta}$$
+        =f'(x)\approx\frac{f(x+\eta)-f(x-\eta)}{2\eta}$$
 
         """
         self.curve = curve
         self.h = h
+        self._derivative = None
+        self._stamp = None
 
     def __call__(self, x):
-        return finite_difference(self.curve, x, self.h)
+        if self._stamp is None or not self._stamp.valid(self.curve):
+            self._stamp = _Stamp(self.curve)
+            d = _derive(self.curve, self.h)
+            if isinstance(d, _Curve):
+                d = d.compile()
+            self._derivative = d
+        d = self._derivative
+        if d is None:
+            y = self.curve(Dual(x, 1.0))
+            if isinstance(y, Dual):
+                return y.d
+            # opaque callable, so skip dual numbers from now on
+            d = self._derivative = \
+                partial(finite_difference, self.curve, h=self.h)
+        return d(x) if callable(d) else d
+
+    def _nodes(self):
+        return self.curve,
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.curve})"
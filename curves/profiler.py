@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+
+# curves
+# ------
+# functional curve algebra (created by auxilium)
+#
+# Author:   sonntagsgesicht
+# Version:  0.1.4, copyright Friday, 11 October 2024
+# Website:  https://github.com/sonntagsgesicht/curves
+# License:  Apache License 2.0 (see LICENSE file)
+
+
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock, get_ident
+from time import perf_counter
+
+from .curves import Curve
+from .operators import Integral, Derivative
+
+WIDTH = 60
+
+_ACTIVE = Lock()  # only one profiler at a time
+_SHIFT = 1 << 62  # generation shift while profiling
+
+
+class _Node:
+    """profile statistics of a single node"""
+
+    __slots__ = 'node', 'calls', 'cumulative', 'own', 'hits', 'misses', \
+        'children'
+
+    def __init__(self, node):
+        self.node = node
+        self.calls = 0
+        self.cumulative = 0.0
+        self.own = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.children = {}
+
+    @property
+    def label(self):
+        label = str(self.node)
+        if WIDTH < len(label):
+            label = label[:WIDTH - 3] + '...'
+        return label
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+
+def _integral_hit(node, x):
+    stamp = node._stamp
+    if not node.cache or stamp is None or not stamp.valid(node.curve):
+        return False
+    xs = node._xs
+    i = bisect_left(xs, x)
+    return i < len(xs) and xs[i] == x
+
+
+def _derivative_hit(node, x):
+    stamp = node._stamp
+    return stamp is not None and stamp.valid(node.curve)
+
+
+class Profiler:
+
+    def __init__(self):
+        r"""profiles evaluation of curve expression trees
+
+        Inside a **with** statement any call of
+        a |Curve|, an |Integral| or a |Derivative| is recorded
+        with number of calls, cumulative time (including sub nodes),
+        self time (excluding sub nodes)
+        and cache hit rate (of |Integral| and |Derivative|).
+
+        >>> from curves import X, Curve, Integral
+        >>> from curves.functions import exp
+        >>> from curves.profiler import Profiler
+
+        >>> f = Curve(exp @ (2 * X), id='f')
+        >>> F = Integral(f, cache=10)
+
+        >>> with Profiler() as p:
+        ...     _ = F(1.0), F(1.0)
+
+        >>> p.tree()
+        {'Integral(f)': {'calls': 2, 'cumulative': ..., 'self': ..., 'hit_rate': 0.5, 'children': {'f': {'calls': ..., 'children': {...}}}}}
+
+        Printing the profiler shows the tree (node labels are ids
+        or representations of nodes).
+        Statistics are collected per node,
+        so a node shared by many parents shows its totals under each.
+
+        >>> print(p)  # doctest: +SKIP
+            calls  cumulative        self     hits  node
+                2    1.37e-04    1.05e-05    50.0%  Integral(f)
+               15    1.27e-04    1.83e-05           f
+               15    8.53e-05    2.27e-05             exp(2 * X)
+               15    4.03e-05    1.61e-05               2 * X
+               15    1.18e-05    1.18e-05                 2
+               15    1.25e-05    1.25e-05                 X
+               15    1.15e-05    1.15e-05               exp
+
+        Profiling replaces methods of |Curve| and operators
+        on class level, so only one profiler can be active at a time
+        and only calls of the thread which entered it are recorded.
+        Compiled curves (see |Curve.compile()|)
+        are evaluated node by node while profiling.
+
+        """  # noqa 501
+        self.nodes = {}
+        self.roots = {}
+        self._stack = []
+        self._patched = {}
+        self._owner = None
+
+    def __enter__(self):
+        if not _ACTIVE.acquire(blocking=False):
+            raise RuntimeError("another profiler is already active")
+        self._owner = get_ident()
+        patches = ((Curve, '__call__', None), (Curve, 'eval_many', None),
+                   (Integral, '__call__', _integral_hit),
+                   (Derivative, '__call__', _derivative_hit))
+        for cls, name, probe in patches:
+            func = self._patched[cls, name] = vars(cls)[name]
+            setattr(cls, name, self._wrap(func, probe))
+        # compiled functions fall back to curves on a generation mismatch,
+        # shifting (and shifting back) keeps any version stamp valid
+        Curve._profiling = True
+        Curve._generation -= _SHIFT
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Curve._generation += _SHIFT
+        Curve._profiling = False
+        for (cls, name), func in self._patched.items():
+            setattr(cls, name, func)
+        self._patched.clear()
+        _ACTIVE.release()
+        return False
+
+    def _wrap(self, func, probe=None):
+        nodes, roots, stack = self.nodes, self.roots, self._stack
+        owner = self._owner
+
+        @wraps(func)
+        def profiled(node, *args):
+            if not get_ident() == owner:
+                return func(node, *args)
+            stats = nodes.get(id(node))
+            if stats is None:
+                stats = nodes[id(node)] = _Node(node)
+            if probe is not None:
+                if probe(node, *args):
+                    stats.hits += 1
+                else:
+                    stats.misses += 1
+            parent = stack[-1][0].children if stack else roots
+            parent[id(node)] = stats
+            frame = [stats, 0.0]
+            stack.append(frame)
+            start = perf_counter()
+            try:
+                return func(node, *args)
+            finally:
+                elapsed = perf_counter() - start
+                stack.pop()
+                stats.calls += 1
+                stats.cumulative += elapsed
+                stats.own += elapsed - frame[1]
+                if stack:
+                    stack[-1][1] += elapsed
+
+        return profiled
+
+    def tree(self):
+        """profile statistics as nested dict keyed by node labels"""
+        return self._tree(self.roots.values(), ())
+
+    def _tree(self, nodes, path):
+        tree = {}
+        for stats in nodes:
+            label, n = stats.label, 1
+            while label in tree:
+                n += 1
+                label = f"{stats.label} #{n}"
+            children = ()
+            if stats not in path:
+                children = stats.children.values()
+            tree[label] = {
+                'calls': stats.calls,
+                'cumulative': stats.cumulative,
+                'self': stats.own,
+                'hit_rate': stats.hit_rate,
+                'children': self._tree(children, path + (stats,))
+            }
+        return tree
+
+    def __str__(self):
+        lines = [f"{'calls':>9} {'cumulative':>11} {'self':>11} "
+                 f"{'hits':>8}  node"]
+        lines.extend(self._lines(self.roots.values(), ()))
+        return '\n'.join(lines)
+
+    def _lines(self, nodes, path):
+        indent = '  ' * len(path)
+        for stats in nodes:
+            rate = stats.hit_rate
+            rate = '' if rate is None else f"{rate:.1%}"
+            yield (f"{stats.calls:9d} {stats.cumulative:11.2e} "
+                   f"{stats.own:11.2e} {rate:>8}  {indent}{stats.label}")
+            if stats not in path:
+                yield from self._lines(stats.children.values(),
+                                       path + (stats,))
@@ -10,11 +10,18 @@
 # License:  Apache License 2.0 (see LICENSE file)
 
 
+from functools import partial
 from math import log, exp
 from unittest.case import TestCase
 
 from curves.interpolation import flat, no, left, right, loglinear, nearest, \
-    linear, zero, loglinearrate, constant, logconstantrate
+    linear, zero, loglinearrate, constant, logconstantrate, piecewise_linear, \
+    extrapolation, waterfall, waterfall_extrapolation
+from curves.numerics import gauss_kronrod
+
+
+def zero_bond(curve, t):
+    return 100 * exp(-curve(t) * t)
 
 
 class InterpolationUnitTests(TestCase):
@@ -162,3 +169,236 @@ class InterpolationUnitTests(TestCase):
             self.assertTrue(s in ff)
             del ff[s]
             self.assertFalse(s in ff)
+
+    def test_modify(self):
+        for cls in (linear, left, right, nearest, constant):
+            f = cls(self.x, self.y[1:] + [0.05])
+            f[2.] = 0.07
+            f[2.5] = 0.02
+            del f[1.]
+            g = cls([2., 2.5, 3.], [0.07, 0.02, 0.05])
+            self.assertEqual(g.x_list, f.x_list)
+            for s in self.s:
+                self.assertAlmostEqual(g(1 + 3 * s), f(1 + 3 * s))
+
+    def test_update_many(self):
+        for cls in (linear, left, right, nearest, constant, no, zero):
+            f = cls(self.x[:1], self.y[:1])
+            f.update_many(reversed(self.x[1:]), reversed(self.y[1:]))
+            g = cls()
+            for x, y in reversed(list(zip(self.x, self.y))):
+                g[x] = y
+            h = cls(self.x, self.y)
+            self.assertEqual(h.x_list, f.x_list)
+            self.assertEqual(h.x_list, g.x_list)
+            self.assertEqual(list(h.items()), list(g.items()))
+            for s in self.s:
+                self.assertAlmostEqual(h(1 + 3 * s), f(1 + 3 * s))
+                self.assertAlmostEqual(h(1 + 3 * s), g(1 + 3 * s))
+
+    def test_integral(self):
+        y = [0.03, 0.01, 0.02]
+        bounds = [(0., 4.), (1.5, 2.5), (2.5, 1.2), (-1., .5), (3.5, 5.)]
+        for cls in (zero, left, right, constant, linear,
+                    piecewise_linear, loglinear):
+            f = cls(self.x, y)
+            for a, b in bounds:
+                i, _ = gauss_kronrod(f, a, b)
+                self.assertAlmostEqual(i, f.integral(a, b))
+            f[2.5] = 0.05
+            del f[1.]
+            for a, b in bounds:
+                i, _ = gauss_kronrod(f, a, b)
+                self.assertAlmostEqual(i, f.integral(a, b))
+
+        from curves import Integral
+        from curves.interpolation import base_interpolation, identity
+
+        class cubic(base_interpolation):
+            def __call__(self, x):
+                return x ** 3
+
+        # no closed form without _primitive, so quadrature is used
+        self.assertIsNone(cubic().integral)
+        self.assertAlmostEqual(0.25, Integral(cubic())(1.0))
+        self.assertAlmostEqual(0.5, Integral(identity())(1.0))
+
+    def test_gradient(self):
+        x, y, h = [0.5, 1., 2., 3.5], [1., 2., 1.5, 3.], 1e-7
+        s = [-1., .7, 1., 1.2, 2., 2.9, 3.5, 4.]
+        for cls in (zero, left, right, constant, nearest, linear,
+                    piecewise_linear, loglinear, logconstantrate):
+            f = cls(x, y)
+            for t, g in zip(s, f.gradient_many(s)):
+                self.assertEqual(g, f.gradient(t))
+                self.assertLessEqual(len(g), 2)
+                for i, k in enumerate(x):
+                    b = cls(x, y[:i] + [y[i] + h] + y[i + 1:])
+                    d = (b(t) - f(t)) / h
+                    self.assertAlmostEqual(d, g.get(k, 0.0), 5)
+
+        from curves.interpolation import base_interpolation, identity
+
+        class square(base_interpolation):
+            def __call__(self, x):
+                return sum(w * w for w in self._ys) * x
+
+        # no closed form weights, so bump and revalue
+        f = square(x, y)
+        for t, g in zip(s, f.gradient_many(s)):
+            for k, w in zip(x, y):
+                self.assertAlmostEqual(2 * w * t, g.get(k, 0.0), 5)
+        self.assertEqual({}, identity().gradient(1.))
+
+    def test_mapping(self):
+        x, y = [0.5, 1., 2., 3.5], [1., 2., 1.5, 3.]
+        for cls in (no, zero, left, right, constant, nearest, linear,
+                    piecewise_linear):
+            f = cls(x, y)
+            self.assertEqual(dict(zip(x, y)), dict(f.items()))
+            self.assertEqual(len(x), len(f))
+            self.assertIn(1, f)
+            self.assertNotIn(1.5, f)
+            self.assertNotIn('1', f)
+            self.assertEqual(2., f[1])
+            self.assertRaises(KeyError, f.__getitem__, 1.5)
+            f[1.5] = 2.5
+            del f[1]
+            self.assertRaises(KeyError, f.__delitem__, 1)
+            self.assertEqual([0.5, 1.5, 2., 3.5], list(f))
+            self.assertEqual([1., 2.5, 1.5, 3.], list(f.values()))
+            self.assertEqual(dict(f), dict(f.copy()))
+            g = f | {5.: 1.}
+            self.assertEqual([0.5, 1.5, 2., 3.5, 5.], list(g))
+            self.assertEqual([0.5, 1.5, 2., 3.5], list(f))
+            g |= {6.: 1.}
+            self.assertEqual(6, len(g))
+
+        f = loglinear(x, y)
+        for g in (f.copy(), f | {}):
+            self.assertEqual(dict(f), dict(g))
+            for t in self.s:
+                self.assertAlmostEqual(f(t), g(t))
+
+    def test_fit_jacobian(self):
+        from curves import Curve, Integral, fit
+
+        c = Curve(0.0)
+        grid, targets = [1., 2., 3., 5.], [99., 97.5, 95., 91.]
+        err = [partial(lambda t: 100 * exp(-Integral(c)(t)), t) for t in grid]
+        fitted, jac = fit(c, grid, err, targets, jacobian=True, tol=1e-12)
+        h = 1e-4
+        for j in range(len(grid)):
+            bumped = targets[:j] + [targets[j] + h] + targets[j + 1:]
+            refit = fit(c, grid, err, bumped, tol=1e-12)
+            for i, t in enumerate(grid):
+                d = (refit[t] - fitted[t]) / h
+                self.assertAlmostEqual(d, jac[i][j], 5)
+
+        self.assertEqual(({}, []), fit(c, [], [], jacobian=True))
+
+    def test_fit_warm_start(self):
+        from curves import Curve, fit
+
+        c, calls = Curve(0.0), []
+
+        def err(t):
+            calls.append(t)
+            return zero_bond(c, t)
+
+        grid = [1., 2., 3., 5., 7., 10.]
+        rates = [0.02 + 0.002 * t for t in grid]
+        targets = [100 * exp(-r * t) for r, t in zip(rates, grid)]
+        err = [partial(err, t) for t in grid]
+        for method, kwargs in (('secant_method', {'a': 0.01, 'b': 0.1}),
+                               ('newton_raphson', {'a': 0.01})):
+            calls.clear()
+            fitted = fit(c, grid, err, targets, None, method, **kwargs)
+            cold = len(calls)
+
+            calls.clear()
+            warm = fit(c, grid, err, targets, None, method)
+            self.assertLess(len(calls), cold)
+            cold = len(calls)
+
+            calls.clear()
+            seeded = fit(c, grid, err, targets, None, method,
+                         initial_guess=fitted)
+            self.assertLess(len(calls), cold)
+            for r, t in zip(rates, grid):
+                self.assertAlmostEqual(r, fitted[t], 12)
+                self.assertAlmostEqual(r, warm[t], 12)
+                self.assertAlmostEqual(r, seeded[t], 12)
+
+    def test_fit_executor(self):
+        from concurrent.futures import ThreadPoolExecutor, \
+            ProcessPoolExecutor
+        from curves import Curve, fit
+
+        grid = [1., 2., 3., 5.]
+        targets = [99., 97.5, 95., 91.]
+        c = Curve(0.001, id='fit_executor')
+        for interpolation_type in ('constant', 'linear'):
+            expected = fit(c, grid, partial(zero_bond, c), targets,
+                           interpolation_type)
+            for cls in (ThreadPoolExecutor, ProcessPoolExecutor):
+                with cls(2) as executor:
+                    fitted = fit(c, grid, partial(zero_bond, c), targets,
+                                 interpolation_type, executor=executor)
+                self.assertEqual(list(expected), list(fitted))
+                for t in grid:
+                    self.assertAlmostEqual(expected[t], fitted[t])
+        self.assertEqual(0.001, c(1.))
+        self.assertEqual(repr(Curve(0.001)), repr(c))
+
+    def test_fit_many_executor(self):
+        from concurrent.futures import ThreadPoolExecutor, \
+            ProcessPoolExecutor
+        from curves import Curve, fit, fit_many
+
+        grid = [1., 2., 3., 5.]
+        targets = [99., 97.5, 95., 91.]
+        curves = [Curve(0.001 * i) for i in range(4)]
+        err_funcs = [partial(zero_bond, c) for c in curves]
+        expected = [fit(c, grid, f, targets)
+                    for c, f in zip(curves, err_funcs)]
+        for cls in (ThreadPoolExecutor, ProcessPoolExecutor):
+            with cls(2) as executor:
+                fitted = fit_many(curves, grid, err_funcs, [targets] * 4,
+                                  executor=executor)
+            for e, f in zip(expected, fitted):
+                self.assertEqual(list(e), list(f))
+                for t in grid:
+                    self.assertAlmostEqual(e[t], f[t])
+        for c, i in zip(curves, range(4)):
+            self.assertEqual(repr(Curve(0.001 * i)), repr(c))
+
+    def test_eval_many(self):
+        x = [0., 1., 1.5, 2., 2.01, 2.5, 3., 4.]
+        xx = x + list(reversed(x)) + [2., 0., 3.5, 1.]
+        yy = [x * .5 for x in self.x]
+        for cls in (no, zero, left, right, nearest, constant,
+                    linear, piecewise_linear,
+                    loglinear, loglinearrate, logconstantrate):
+            f = cls(self.x, yy)
+            for s in (x, xx, tuple(xx)):
+                self.assertEqual([f(_) for _ in s], f.eval_many(s))
+                self.assertEqual([f(_) for _ in s], f(s))
+        f = flat(0.01)
+        self.assertEqual([0.01] * len(x), f(x))
+
+    def test_extrapolation(self):
+        x = [0., 1., 1.5, 2., 2.01, 2.5, 3., 4.]
+        xx = x + list(reversed(x)) + [2., 0., 3.5, 1.]
+        f = extrapolation(self.x, self.y, mid=constant,
+                          left=linear, right=linear)
+        g = waterfall(linear([2., 3.], [1., 2.]),
+                      constant([1., 2.5], [3., 4.]),
+                      right=linear([0., 2.], [2., 1.]))
+        h = waterfall_extrapolation(linear([2., 3.], [1., 2.]),
+                                    constant([1., 2.5], [3., 4.]),
+                                    left=linear([0., 2.], [2., 1.]))
+        for c in (f, g, h):
+            for s in (x, xx):
+                self.assertEqual([c(_) for _ in s], c.eval_many(s))
+                self.assertEqual([c(_) for _ in s], c(s))
@@ -53,3 +53,446 @@ class CurveTestCase(TestCase):
         for x in self.x:
             self.assertAlmostEqual(f(g(h))(x), 1)
             self.assertAlmostEqual(g(h)(x), g(1))
+
+    def test_eval_many(self):
+        from curves.functions import exp, sin
+
+        p = 1 + 2 * X + 3 * X ** 2 + -(X / 2 - 1)
+        q = exp @ (p / 100) - abs(sin) * X
+        for c in (X, p, q, p @ q, Curve(1.5)):
+            for x, y in zip(self.x, c.eval_many(self.x)):
+                self.assertAlmostEqual(c(x), y)
+            self.assertEqual(c.eval_many(self.x), c(self.x))
+
+    def test_compose_interpolation(self):
+        from curves.interpolation import linear
+
+        f = linear([1., 2.], [3., 4.])
+        for c in (X, 2 * X, X + 1):
+            g = c(f)
+            self.assertIsInstance(g, Curve)
+            for x in self.x:
+                self.assertAlmostEqual(c(f(x)), g(x))
+        self.assertEqual([6., 8.], (2 * X)([f(1.), f(2.)]))
+
+    def test_compile(self):
+        from curves.functions import exp, sin
+
+        p = 1 + 2 * X + 3 * X ** 2 + -(X / 2 - 1)
+        q = exp @ (p / 100) - abs(sin) * X
+        for c in (X, p, q, p @ q, Curve(1.5)):
+            f = c.compile()
+            for x in self.x:
+                self.assertEqual(c(x), f(x))
+
+        c = Curve(X + 1)
+        g = (c * q).compile()
+        c.curve = X - 1
+        c += 2 * X
+        for x in self.x:
+            self.assertEqual((c * q)(x), g(x))
+
+    def test_versions(self):
+        from curves import Integral, Derivative
+        from curves.functions import exp
+        from curves.interpolation import linear
+
+        def unrelated():
+            c = Curve(1.)
+            c.curve = 2.
+            c += 1
+            f = linear([0., 1.], [1., 2.])
+            f[2.] = 3.
+
+        d, lin = Curve(1.), linear([0., 1., 4.], [1., 2., 0.])
+        c = exp @ (X * d) + lin
+        f = c.compile()
+        F, D = Integral(c, cache=10), Derivative(c)
+        F(1.), D(1.)
+        derivative = D._derivative
+        unrelated()
+        self.assertIs(f, c.compile())
+        F(2.), D(1.)
+        self.assertEqual([1., 2.], F._xs)
+        self.assertIs(derivative, D._derivative)
+
+        generation = Curve._generation
+        lin[2.] = 1.
+        self.assertEqual(generation, Curve._generation)
+        self.assertIs(f, c.compile())
+        F(3.), D(1.)
+        self.assertEqual([3.], F._xs)
+        self.assertIsNot(derivative, D._derivative)
+
+        d.curve = 2.
+        self.assertIsNot(f, c.compile())
+        for x in self.x:
+            self.assertEqual(c(x), f(x))
+            self.assertEqual(c(x), c.compile()(x))
+
+    def test_integral(self):
+        from curves import Integral
+
+        c = Curve(1 + X * X)
+        F, G = Integral(c), Integral(c, cache=3)
+        for x in self.x + list(reversed(self.x)):
+            self.assertAlmostEqual(F(x), G(x))
+        self.assertEqual(3, len(G._xs))
+        self.assertEqual(sorted(G._xs), G._xs)
+        for x, y in zip(self.x, F.on_grid(self.x)):
+            self.assertAlmostEqual(F(x), y)
+
+        c += 1
+        for x in self.x:
+            self.assertAlmostEqual(F(x), G(x))
+
+    def test_derivative(self):
+        from math import cos as _cos, exp as _exp, sin as _sin
+        from curves import Derivative
+        from curves.functions import exp, sin
+        from curves.numerics import finite_difference
+
+        p = 2 * X ** 2 + 3 * X + 1
+        c = Curve(X + 1)
+        c *= sin
+        c += 2
+        for f, df in ((p, lambda x: 4 * x + 3),
+                      (exp @ (X / 10), lambda x: _exp(x / 10) / 10),
+                      (X * sin, lambda x: x * _cos(x) + _sin(x)),
+                      (c, lambda x: (x + 1) * _cos(x) + _sin(x))):
+            d = Derivative(f)
+            for x in self.x[::10]:
+                self.assertAlmostEqual(df(x), d(x))
+                self.assertAlmostEqual(finite_difference(f, x), d(x), 5)
+        self.assertIsInstance(Derivative(Curve('X') ** 2)(6), float)
+
+    def test_dual(self):
+        from curves.dual import Dual, derivative, derivative_many
+        from curves.functions import exp, sin
+        from curves.interpolation import linear, loglinear
+        from curves.numerics import finite_difference
+
+        c = Curve(X + 1)
+        c *= sin
+        lin = linear([-5., 0., 5.], [1., 2., 0.])
+        log = loglinear([-5., 0., 5.], [1., 2., 3.])
+        for f in (2 * X ** 2 + 3 * X + 1, exp @ (X / 10), c, lin,
+                  lin * sin + 1, exp @ lin, log, Curve(log) / (1 + X ** 2)):
+            x_list = self.x[1::10]
+            d_list = derivative_many(f, x_list)
+            for x, d in zip(x_list, d_list):
+                self.assertIsInstance(f(Dual(x, 1.0)), Dual)
+                self.assertAlmostEqual(derivative(f, x), d)
+                self.assertAlmostEqual(finite_difference(f, x), d, 5)
+
+    def test_opaque_derivative(self):
+        from math import exp as _exp
+        from curves import Derivative
+        from curves.numerics import solve
+
+        calls = []
+
+        def f(x):
+            calls.append(x)
+            return _exp(float(x)) - 3
+
+        d, x_list = Derivative(f), [0., .5, 1., 1.5, 2.]
+        for x in x_list:
+            self.assertAlmostEqual(_exp(x), d(x), 5)
+        # one dual number probe, then finite differences only
+        self.assertEqual(1 + 2 * len(x_list), len(calls))
+
+        calls.clear()
+        _, info = solve(f, 'newton', a=0.5, full_output=True)
+        # value and two finite differences per step
+        self.assertEqual(3 * info['iterations'], len(calls))
+
+    def test_dual_flat(self):
+        from curves import Derivative
+        from curves.dual import Dual
+        from curves.functions import exp
+        from curves.interpolation import piecewise_linear, left, right, \
+            nearest, flat
+        from curves.numerics import solve
+
+        # flat regions keep dual numbers, so no finite differences follow
+        for f, x, d in ((piecewise_linear([0, 1], [0, 2]), .5, 2.),
+                        (left([0, 1], [0, 2]), .5, 0.),
+                        (right([0, 1], [0, 2]), .5, 0.),
+                        (nearest([0, 1], [0, 2]), .25, 0.),
+                        (flat(2.), .5, 0.),
+                        (exp @ flat(2.), .5, 0.)):
+            self.assertIsInstance(f(Dual(-1., 1.)), Dual)
+            self.assertIsInstance(f(Dual(9., 1.)), Dual)
+            D = Derivative(f)
+            self.assertEqual(0., D(-1.0))
+            self.assertEqual(d, D(x))
+
+        # compiled curves pass dual numbers to opaque constants
+        c = exp + X - 5
+        f = c.compile()
+        self.assertAlmostEqual(c(Dual(1., 1.)).d, f(Dual(1., 1.)).d)
+        self.assertAlmostEqual(solve(c, 'newton', a=1.0),
+                               solve(f, 'newton', a=1.0))
+
+    def test_solve_many(self):
+        from curves.functions import exp
+        from curves.numerics import solve, solve_many
+
+        c_list = [1.5 + i / 10 for i in range(10)]
+
+        def err(x_list):
+            return [y - c for y, c in zip(exp.eval_many(x_list), c_list)]
+
+        for method in ('secant', 'brent', 'bisection', 'newton'):
+            kwargs = {'a': 0.3} if method == 'newton' else {'a': 0.3, 'b': 2.}
+            roots = solve_many(err, method, size=len(c_list), **kwargs)
+            for c, root in zip(c_list, roots):
+                self.assertAlmostEqual(solve(exp - c, method, **kwargs), root)
+
+    def test_solve_bounds(self):
+        from curves.numerics import solve
+
+        calls = []
+
+        def f(x):
+            calls.append(float(x))
+            return x * x + x - 2
+
+        for method in ('secant', 'brent', 'bisection', 'newton'):
+            initials = {'a': 0.0}, {'guess': 0.0}
+            if not method == 'newton':
+                initials = {'a': 0.0, 'b': 2.0}, {'bounds': (0.0, 2.0)}
+            for kwargs in initials:
+                calls.clear()
+                self.assertAlmostEqual(1.0, solve(f, method, **kwargs))
+                self.assertEqual(0.0, calls[0])
+
+    def test_solve_evaluations(self):
+        from curves.numerics import solve
+
+        # evaluations per solver in terms of iterations
+        counts = {'secant': 1, 'brent': 1, 'bisection': 2, 'newton': 0}
+        for f in (X * X - 2, lambda x: x * x - 2):
+            for method, n in counts.items():
+                kwargs = {'a': 1.0} if method == 'newton' else \
+                    {'a': 1.0, 'b': 2.0}
+                _, info = solve(f, method, full_output=True, **kwargs)
+                self.assertEqual(info['iterations'] + n, info['evaluations'])
+
+    def test_solve_args(self):
+        from math import sqrt
+        from curves import fit
+        from curves.numerics import solve
+
+        f = X * X - 2
+        for method in ('secant', 'brent', 'bisection'):
+            self.assertAlmostEqual(sqrt(2), solve(f, method, 1., 2., 1e-12))
+            self.assertAlmostEqual(sqrt(2), solve(f, method, 1., 2., 1e-12,
+                                                  100))
+        self.assertAlmostEqual(sqrt(2), solve(f, 'newton', 1., 1e-12))
+
+        c = Curve(0.0)
+        for args in (('secant', 1., 2., 1e-12), ('bisection', 0., 9., 1e-12),
+                     ('newton', 1., 1e-12)):
+            fitted = fit(c, [1., 2.], c / 2, [1., 2.], None, *args)
+            self.assertAlmostEqual(2., fitted[1.])
+            self.assertAlmostEqual(4., fitted[2.])
+
+    def test_registry(self):
+        a = Curve(1., id='registry')
+        with self.assertRaises(ValueError):
+            Curve(2., id='registry')
+        with Curve.scope():
+            b = Curve(2., id='registry')
+            self.assertEqual(2., b(0.))
+            with self.assertRaises(ValueError):
+                Curve(3., id='registry')
+        del a
+        a = Curve(3., id='registry')
+        Curve.release('registry')
+        b = Curve(4., id='registry')
+        Curve.release()
+        c = Curve(5., id='registry')
+        self.assertEqual([3., 4., 5.], [a(0.), b(0.), c(0.)])
+
+        # each thread has its own registry
+        from threading import Thread
+        curves = []
+
+        def create():
+            curves.append(Curve(6., id='registry'))
+
+        for _ in range(2):
+            thread = Thread(target=create)
+            thread.start()
+            thread.join()
+        self.assertEqual(2, len(curves))
+        with self.assertRaises(ValueError):
+            Curve(6., id='registry')
+
+        with self.assertWarns(DeprecationWarning):
+            self.assertIs(c, Curve._cache['registry'])
+
+    def test_trace(self):
+        records = []
+        c = Curve(X, id='trace')
+        try:
+            Curve.trace(records.append)
+            c(1.)
+            c += 1
+            c.compile()(2.)
+            self.assertEqual(['1.0 = trace(1.0)', 'trace += 1',
+                              '3.0 = trace(2.0)'], list(map(str, records)))
+            Curve.trace(records.append, sample=3)
+            c.eval_many(range(5))
+            for x in range(5):
+                c(x)
+            self.assertEqual(5, len(records))
+        finally:
+            Curve.trace(None)
+        c(1.)
+        self.assertEqual(5, len(records))
+
+        def logger(record):
+            records.append(str(record))
+
+        try:
+            from logging import debug
+            Curve.trace(debug)
+            c(1.)
+            Curve.trace(logger)
+            c(1.)
+            c.compile()(2.)
+            self.assertEqual(['2.0 = trace(1.0)', '3.0 = trace(2.0)'],
+                             records[-2:])
+        finally:
+            Curve.trace(None)
+
+        # no records are created while logging is disabled
+        from curves import curves
+        created = []
+
+        class Record(curves._Record):
+            def __init__(self, *args):
+                created.append(args)
+                super().__init__(*args)
+
+        _Record, curves._Record = curves._Record, Record
+        try:
+            d = Curve(X, id='no trace')
+            for x in range(100):
+                c(x), d(x)
+            c += 1
+            d.curve = X
+            float(Curve(1., id='no float trace'))
+        finally:
+            curves._Record = _Record
+        self.assertEqual([], created)
+
+    def test_profiler(self):
+        from curves import Derivative
+        from curves.functions import exp
+        from curves.profiler import Profiler
+
+        c = Curve(exp @ (2 * X), id='profile') + X
+        f, d = c.compile(), Derivative(c)
+        with Profiler() as p:
+            for x in self.x[:10]:
+                self.assertAlmostEqual(c(x), f(x))
+                d(x)
+        tree = p.tree()
+        self.assertEqual(20, tree[str(c)]['calls'])
+        self.assertEqual(20, tree[str(c)]['children']['profile']['calls'])
+        self.assertEqual(0.9, tree[repr(d)]['hit_rate'])
+        for node in tree.values():
+            self.assertLessEqual(node['self'], node['cumulative'])
+        self.assertIs(Curve.__call__, vars(Curve)['__call__'])
+        self.assertNotIn('profiled', Curve.__call__.__code__.co_name)
+        self.assertEqual(c(0.5), f(0.5))
+
+        # warm caches stay warm
+        from threading import Thread
+        from curves import Integral
+        F, generation = Integral(c, cache=10), Curve._generation
+        F(1.), d(1.)
+        with Profiler() as p:
+            F(1.), d(1.)
+            thread = Thread(target=F, args=(2.,))
+            thread.start()
+            thread.join()
+            with self.assertRaises(RuntimeError):
+                with Profiler():
+                    pass
+        tree = p.tree()
+        self.assertEqual(1.0, tree[repr(F)]['hit_rate'])
+        self.assertEqual(1.0, tree[repr(d)]['hit_rate'])
+        self.assertEqual(1, tree[repr(F)]['calls'])
+        self.assertEqual(generation, Curve._generation)
+
+    def test_cached(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from time import sleep
+
+        calls = []
+
+        def func(x):
+            calls.append(x)
+            return x * x
+
+        c = Curve.cached(func, maxsize=3)
+        for x in (1., 2., 1., 3., 4., 1., 2.):
+            self.assertEqual(x * x, c(x))
+        self.assertEqual([1., 2., 3., 4., 2.], calls)
+        self.assertEqual({'hits': 2, 'misses': 5, 'maxsize': 3,
+                          'currsize': 3}, c.cache_info())
+        c.cache_clear()
+        self.assertEqual(0, c.cache_info()['currsize'])
+
+        @Curve.cached(maxsize=2)
+        def square(x):
+            return func(x)
+
+        for x in (1., 2., 3.):
+            square(x)
+        self.assertEqual({'hits': 0, 'misses': 3, 'maxsize': 2,
+                          'currsize': 2}, square.cache_info())
+        self.assertEqual(5, Curve.cached(5)(func).cache_info()['maxsize'])
+        self.assertEqual(128, Curve.cached()(func).cache_info()['maxsize'])
+        unbounded = Curve.cached(None)(func)
+        for x in range(200):
+            unbounded(float(x))
+        self.assertEqual({'hits': 0, 'misses': 200, 'maxsize': None,
+                          'currsize': 200}, unbounded.cache_info())
+
+        # only modifications of the cached curve clear the cache
+        from curves.interpolation import linear
+        f, g = linear([0., 1.], [1., 2.]), linear([0., 1.], [1., 2.])
+        d = Curve(1.)
+        q = (d * f).cached()
+        q(.5), q(.6)
+        g[2.] = 3.
+        Curve(1.).curve = 2.
+        q += 1
+        self.assertEqual(2, q.cache_info()['currsize'])
+        self.assertEqual(2.5, q(.5))
+        f[.5] = 2.
+        self.assertEqual(3., q(.5))
+        self.assertEqual(1, q.cache_info()['currsize'])
+        d.curve = 2.
+        self.assertEqual(5., q(.5))
+
+        t = Curve(func).cached(ttl=0.01)
+        calls.clear()
+        t(1.), t(1.)
+        sleep(0.02)
+        t(1.)
+        self.assertEqual([1., 1.], calls)
+
+        p = (X * X + 1).cached(maxsize=None)
+        with ThreadPoolExecutor(4) as executor:
+            y_list = list(executor.map(p, self.x * 4))
+        self.assertEqual([x * x + 1 for x in self.x * 4], y_list)
+        info = p.cache_info()
+        self.assertEqual(len(self.x), info['currsize'])
+        self.assertEqual(4 * len(self.x), info['hits'] + info['misses'])